@@ -0,0 +1,186 @@
+import time
+from collections import namedtuple
+from typing import Dict, List, Optional
+
+# A single rung on the quality ladder. Lower rungs are cheaper to process.
+QualityLevel = namedtuple('QualityLevel', ['fps', 'width', 'height', 'model_complexity', 'max_num_hands'])
+
+# Ordered from best to cheapest. Under load we first drop the frame rate,
+# then the detection resolution, and only then the MediaPipe model itself.
+DEFAULT_QUALITY_LEVELS = [
+    QualityLevel(fps=10, width=640, height=480, model_complexity=1, max_num_hands=2),
+    QualityLevel(fps=8, width=640, height=480, model_complexity=1, max_num_hands=2),
+    QualityLevel(fps=6, width=640, height=480, model_complexity=1, max_num_hands=2),
+    QualityLevel(fps=6, width=480, height=360, model_complexity=1, max_num_hands=2),
+    QualityLevel(fps=6, width=320, height=240, model_complexity=1, max_num_hands=2),
+    QualityLevel(fps=6, width=320, height=240, model_complexity=0, max_num_hands=2),
+    QualityLevel(fps=6, width=320, height=240, model_complexity=0, max_num_hands=1),
+]
+
+
+class AdaptiveQualityController:
+    def __init__(self,
+                 target_latency: float = 0.08,
+                 levels: Optional[List[QualityLevel]] = None,
+                 smoothing: float = 0.2,
+                 downgrade_ratio: float = 1.0,
+                 upgrade_ratio: float = 0.6,
+                 downgrade_patience: int = 5,
+                 upgrade_patience: int = 30,
+                 cooldown_frames: int = 15,
+                 max_backoff: int = 5):
+        """
+        Control loop that trades processing quality for per-frame latency.
+
+        Latency is tracked as an exponential moving average. The controller
+        steps down one level once the average has stayed above
+        ``target_latency * downgrade_ratio`` for ``downgrade_patience`` frames,
+        and steps back up only after it has stayed below
+        ``target_latency * upgrade_ratio`` for ``upgrade_patience`` frames.
+        The gap between the two ratios plus the cooldown after every change
+        is the hysteresis that keeps it from oscillating.
+
+        The controller also remembers the latency it saw at each level it had
+        to leave. Stepping back up to a level that was measured over budget
+        is a likely failure, so the patience for that step doubles after
+        each such failure (up to ``2 ** max_backoff`` times). A level that
+        holds up for ``upgrade_patience`` frames clears its record. This way
+        a level that is just too slow is retried less and less often, instead
+        of every few seconds, while a lighter load is still noticed eventually.
+
+        Args:
+            target_latency: Per-frame processing budget in seconds
+            levels: Quality ladder ordered from best to cheapest
+            smoothing: EMA weight given to the newest sample
+            downgrade_ratio: Fraction of the budget that counts as overloaded
+            upgrade_ratio: Fraction of the budget that counts as headroom
+            downgrade_patience: Consecutive overloaded frames before stepping down
+            upgrade_patience: Consecutive frames with headroom before stepping up
+            cooldown_frames: Frames to ignore after a level change
+            max_backoff: Most doublings of the upgrade patience for a level that failed
+        """
+        self.levels = list(levels or DEFAULT_QUALITY_LEVELS)
+        self.target_latency = target_latency
+        self.smoothing = smoothing
+        self.downgrade_ratio = downgrade_ratio
+        self.upgrade_ratio = upgrade_ratio
+        self.downgrade_patience = downgrade_patience
+        self.upgrade_patience = upgrade_patience
+        self.cooldown_frames = cooldown_frames
+        self.max_backoff = max_backoff
+
+        self.level_index = 0
+        self.avg_latency = None
+        self.last_latency = None
+        self._over_budget_frames = 0
+        self._under_budget_frames = 0
+        self._cooldown = 0
+        self._frames_at_level = 0
+        # Average latency measured at each level when it was left for being too slow
+        self.level_latency = {}
+        self._failures = [0] * len(self.levels)
+        self.downgrades = 0
+        self.upgrades = 0
+        self.last_change_time = None
+
+    @property
+    def level(self) -> QualityLevel:
+        """The quality level currently in effect."""
+        return self.levels[self.level_index]
+
+    @property
+    def frame_interval(self) -> float:
+        """Seconds between frames at the current frame rate."""
+        return 1.0 / self.level.fps
+
+    def record(self, latency: float) -> bool:
+        """
+        Feed one measured frame latency into the control loop.
+
+        Args:
+            latency: Processing time of the last frame in seconds
+
+        Returns:
+            True if the quality level changed as a result
+        """
+        self.last_latency = latency
+        if self.avg_latency is None:
+            self.avg_latency = latency
+        else:
+            self.avg_latency += self.smoothing * (latency - self.avg_latency)
+
+        if self._cooldown > 0:
+            self._cooldown -= 1
+            return False
+        
+        self._frames_at_level += 1
+        if self._frames_at_level == self.upgrade_patience and self._failures[self.level_index]:
+            # The level has held up, so whatever made it too slow has passed
+            self._failures[self.level_index] = 0
+            self.level_latency.pop(self.level_index, None)
+
+        if self.avg_latency > self.target_latency * self.downgrade_ratio:
+            self._over_budget_frames += 1
+            self._under_budget_frames = 0
+        elif self.avg_latency < self.target_latency * self.upgrade_ratio:
+            self._under_budget_frames += 1
+            self._over_budget_frames = 0
+        else:
+            # Inside the hysteresis band: hold the current level.
+            self._over_budget_frames = 0
+            self._under_budget_frames = 0
+
+        if self._over_budget_frames >= self.downgrade_patience and self.level_index < len(self.levels) - 1:
+            self.level_latency[self.level_index] = self.avg_latency
+            self._failures[self.level_index] += 1
+            self._set_level(self.level_index + 1)
+            self.downgrades += 1
+            return True
+
+        if self.level_index > 0 and self._under_budget_frames >= self._upgrade_patience_for(self.level_index - 1):
+            self._set_level(self.level_index - 1)
+            self.upgrades += 1
+            return True
+
+        return False
+
+    def _upgrade_patience_for(self, index: int) -> int:
+        """Frames with headroom needed before stepping up to level ``index``."""
+        remembered = self.level_latency.get(index)
+        if remembered is None or remembered <= self.target_latency * self.downgrade_ratio:
+            return self.upgrade_patience
+        # Predicted not to fit the budget: back off exponentially with every failure
+        return self.upgrade_patience * 2 ** min(self._failures[index], self.max_backoff)
+
+    def _set_level(self, index: int):
+        """Switch to a new level and start the cooldown period."""
+        self.level_index = index
+        self._frames_at_level = 0
+        self._over_budget_frames = 0
+        self._under_budget_frames = 0
+        self._cooldown = self.cooldown_frames
+        self.last_change_time = time.time()
+
+    def get_state(self) -> Dict:
+        """
+        Get the current state of the controller.
+
+        Returns:
+            Dictionary with the active level and latency statistics
+        """
+        level = self.level
+        return {
+            'level': self.level_index,
+            'max_level': len(self.levels) - 1,
+            'fps': level.fps,
+            'resolution': f'{level.width}x{level.height}',
+            'model_complexity': level.model_complexity,
+            'max_num_hands': level.max_num_hands,
+            'target_latency_ms': round(self.target_latency * 1000, 1),
+            'avg_latency_ms': round(self.avg_latency * 1000, 1) if self.avg_latency is not None else None,
+            'last_latency_ms': round(self.last_latency * 1000, 1) if self.last_latency is not None else None,
+            'downgrades': self.downgrades,
+            'upgrades': self.upgrades,
+            'next_upgrade_patience': self._upgrade_patience_for(self.level_index - 1) if self.level_index > 0 else None,
+            'slow_levels_ms': {index: round(latency * 1000, 1) for index, latency in sorted(self.level_latency.items())}
+        }
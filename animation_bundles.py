@@ -0,0 +1,241 @@
+import ast
+import glob
+import hashlib
+import math
+import operator
+import os
+import re
+import struct
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+# Packed bundle layout (all little endian):
+#   header    '<4sHHHH'  magic, version, bone count, sign count, sequence length
+#   bones     per bone:  u8 name length, utf-8 name
+#   signs     per sign:  u8 name length, utf-8 name, u16 keyframe count,
+#                        then per keyframe: u16 track count and the tracks
+#   track     '<HBf'     bone index, flags, float32 target value
+#   sequence  u16 sign indices in playback order (empty for the full library)
+# Track flags: bits 0-1 axis (x, y, z), bit 2 property (0 rotation,
+# 1 position), bit 3 direction (0 '+', 1 '-').
+BUNDLE_MAGIC = b'SLKB'
+BUNDLE_VERSION = 1
+HEADER = struct.Struct('<4sHHHH')
+TRACK = struct.Struct('<HBf')
+
+AXES = {'x': 0, 'y': 1, 'z': 2}
+PROPERTIES = {'rotation': 0, 'position': 1}
+
+ANIMATION_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'js', 'animations')
+
+_FUNCTION_RE = re.compile(r'function\s+([A-Za-z_]\w*)\s*\(\s*ref\s*\)')
+_TRACK_RE = re.compile(
+    r'animations\.push\(\[\s*"(\w+)"\s*,\s*"(\w+)"\s*,\s*"([xyz])"\s*,\s*([^,\]]+?)\s*,\s*"([+-])"\s*\]\)'
+)
+_KEYFRAME_END_RE = re.compile(r'ref\.animations\.push\(\s*animations\s*\)')
+
+_BINARY_OPS = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv}
+_UNARY_OPS = {ast.USub: operator.neg, ast.UAdd: operator.pos}
+
+
+def _evaluate_value(expression: str) -> float:
+    """
+    Evaluate a keyframe target such as ``-Math.PI/2.5`` without running JavaScript.
+
+    Only numbers, ``Math.PI`` and the four arithmetic operators are accepted.
+
+    Args:
+        expression: JavaScript numeric expression
+
+    Returns:
+        Evaluated value
+    """
+    def visit(node):
+        if isinstance(node, ast.Expression):
+            return visit(node.body)
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return float(node.value)
+        if isinstance(node, ast.Name) and node.id == 'PI':
+            return math.pi
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+            return _BINARY_OPS[type(node.op)](visit(node.left), visit(node.right))
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+            return _UNARY_OPS[type(node.op)](visit(node.operand))
+        raise ValueError(f"Unsupported keyframe expression: {expression!r}")
+
+    return visit(ast.parse(expression.replace('Math.PI', 'PI'), mode='eval'))
+
+
+def parse_sign_file(path: str) -> Tuple[str, List[List[Tuple]]]:
+    """
+    Parse one hand-written sign animation script.
+
+    Args:
+        path: Path to a file such as Alphabets/A.js
+
+    Returns:
+        Tuple of (sign name, keyframes), each keyframe being a list of
+        (bone, property, axis, target, direction) tracks
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+
+    match = _FUNCTION_RE.search(source)
+    if not match:
+        raise ValueError(f"No sign function found in '{path}'")
+
+    keyframes = []
+    position = match.end()
+    for end in _KEYFRAME_END_RE.finditer(source, position):
+        tracks = [
+            (bone, prop, axis, _evaluate_value(value), direction)
+            for bone, prop, axis, value, direction in _TRACK_RE.findall(source, position, end.start())
+        ]
+        keyframes.append(tracks)
+        position = end.end()
+
+    return match.group(1), keyframes
+
+
+def pack_bundle(signs: Dict[str, List[List[Tuple]]], sequence: Optional[List[str]] = None) -> bytes:
+    """
+    Pack parsed signs into the binary keyframe format.
+
+    Args:
+        signs: Mapping of sign name to keyframes, in bundle order
+        sequence: Optional playback order (names must be in ``signs``)
+
+    Returns:
+        Bundle bytes
+    """
+    bones = []
+    bone_index = {}
+    for keyframes in signs.values():
+        for tracks in keyframes:
+            for bone, _, _, _, _ in tracks:
+                if bone not in bone_index:
+                    bone_index[bone] = len(bones)
+                    bones.append(bone)
+
+    sign_index = {name: i for i, name in enumerate(signs)}
+    sequence = sequence or []
+    parts = [HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(bones), len(signs), len(sequence))]
+
+    for bone in bones:
+        encoded = bone.encode('utf-8')
+        parts.append(struct.pack('<B', len(encoded)) + encoded)
+
+    for name, keyframes in signs.items():
+        encoded = name.encode('utf-8')
+        parts.append(struct.pack('<B', len(encoded)) + encoded + struct.pack('<H', len(keyframes)))
+        for tracks in keyframes:
+            parts.append(struct.pack('<H', len(tracks)))
+            for bone, prop, axis, target, direction in tracks:
+                flags = AXES[axis] | (PROPERTIES[prop] << 2) | ((direction == '-') << 3)
+                parts.append(TRACK.pack(bone_index[bone], flags, target))
+
+    parts.append(struct.pack(f'<{len(sequence)}H', *(sign_index[name] for name in sequence)))
+    return b''.join(parts)
+
+
+class AnimationBundleCompiler:
+    def __init__(self, root: str = ANIMATION_ROOT, max_cached_bundles: int = 128):
+        """
+        Compile the avatar sign scripts once and serve packed keyframe bundles.
+
+        Args:
+            root: Directory containing the Alphabets/ and Words/ scripts
+            max_cached_bundles: Number of per-sentence bundles kept in memory
+        """
+        self.root = root
+        self.max_cached_bundles = max_cached_bundles
+        self.signs = OrderedDict()
+        self.words = set()
+        self.letters = set()
+        self._bundles = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._compile()
+
+    def _compile(self):
+        """Parse every sign script under the animation root."""
+        for folder, names in (('Words', self.words), ('Alphabets', self.letters)):
+            for path in sorted(glob.glob(os.path.join(self.root, folder, '*.js'))):
+                try:
+                    name, keyframes = parse_sign_file(path)
+                except ValueError as e:
+                    print(f"⚠️ Skipping animation '{path}': {e}")
+                    continue
+                self.signs[name] = keyframes
+                names.add(name)
+
+        self.full_bundle = pack_bundle(self.signs)
+        self.full_hash = hashlib.sha256(self.full_bundle).hexdigest()[:16]
+        print(f"🎞️ Compiled {len(self.signs)} sign animations into a {len(self.full_bundle)} byte bundle")
+
+    def signs_for_text(self, text: str) -> List[str]:
+        """
+        Map a sentence onto sign names, fingerspelling words without an animation.
+
+        Args:
+            text: Sentence to sign
+
+        Returns:
+            Sign names in playback order
+        """
+        sequence = []
+        for word in re.findall(r'[A-Za-z]+', text.upper()):
+            if word in self.words:
+                sequence.append(word)
+            else:
+                sequence.extend(letter for letter in word if letter in self.letters)
+        return sequence
+
+    def bundle_for(self, sequence: List[str]) -> Tuple[bytes, str]:
+        """
+        Get the bundle holding only the signs of a playback sequence.
+
+        Args:
+            sequence: Sign names in playback order (unknown names are dropped)
+
+        Returns:
+            Tuple of (bundle bytes, content hash)
+        """
+        sequence = tuple(name for name in sequence if name in self.signs)
+        with self._lock:
+            cached = self._bundles.get(sequence)
+            if cached is not None:
+                self._bundles.move_to_end(sequence)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        unique = OrderedDict((name, self.signs[name]) for name in sequence)
+        data = pack_bundle(unique, list(sequence))
+        entry = (data, hashlib.sha256(data).hexdigest()[:16])
+
+        with self._lock:
+            self._bundles[sequence] = entry
+            while len(self._bundles) > self.max_cached_bundles:
+                self._bundles.popitem(last=False)
+        return entry
+
+    def get_stats(self) -> Dict:
+        """
+        Get compiler and cache statistics.
+
+        Returns:
+            Dictionary with sign counts, bundle size and cache counters
+        """
+        return {
+            'signs': len(self.signs),
+            'words': sorted(self.words),
+            'letters': len(self.letters),
+            'full_bundle_bytes': len(self.full_bundle),
+            'full_bundle_hash': self.full_hash,
+            'cached_bundles': len(self._bundles),
+            'cache_hits': self.hits,
+            'cache_misses': self.misses
+        }
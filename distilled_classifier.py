@@ -0,0 +1,245 @@
+import argparse
+import os
+import pickle
+from typing import Dict, Optional
+
+import numpy as np
+
+from train_sign_model import DATA_PATH, MODEL_DIR, load_dataset, measure_latency
+
+DISTILLED_MODEL_PATH = os.path.join(MODEL_DIR, 'model_distilled.npz')
+
+NUM_LANDMARKS = 21
+_PAIR_I, _PAIR_J = np.triu_indices(NUM_LANDMARKS, k=1)
+
+
+def engineered_features(features: np.ndarray) -> np.ndarray:
+    """
+    Extend the 42 landmark coordinates with all pairwise landmark distances.
+
+    Distances between joints describe the hand shape directly, which lets a
+    small network match the forest with far fewer parameters.
+
+    Args:
+        features: Array of shape (n_samples, 42)
+
+    Returns:
+        Array of shape (n_samples, 42 + 210)
+    """
+    features = np.asarray(features, dtype=np.float32).reshape(-1, 2 * NUM_LANDMARKS)
+    points = features.reshape(-1, NUM_LANDMARKS, 2)
+    deltas = points[:, _PAIR_I] - points[:, _PAIR_J]
+    distances = np.sqrt((deltas * deltas).sum(axis=2))
+    return np.concatenate([features, distances], axis=1)
+
+
+class DistilledClassifier:
+    def __init__(self, classes: np.ndarray, mean: np.ndarray, std: np.ndarray,
+                 w1: np.ndarray, b1: np.ndarray, w2: np.ndarray, b2: np.ndarray):
+        """
+        Small dense network distilled from the Random Forest.
+
+        Inference is feature engineering plus two matrix multiplies in pure
+        NumPy. It exposes the same predict / predict_proba / classes_
+        interface as the forest, so the recognizer can use either.
+
+        Args:
+            classes: Class labels in output order
+            mean: Input feature means used for standardization
+            std: Input feature standard deviations
+            w1: Hidden layer weights
+            b1: Hidden layer biases
+            w2: Output layer weights
+            b2: Output layer biases
+        """
+        self.classes_ = np.asarray(classes)
+        self.mean = mean.astype(np.float32)
+        self.std = std.astype(np.float32)
+        self.w1 = w1.astype(np.float32)
+        self.b1 = b1.astype(np.float32)
+        self.w2 = w2.astype(np.float32)
+        self.b2 = b2.astype(np.float32)
+
+    def _logits(self, features: np.ndarray) -> np.ndarray:
+        x = (engineered_features(features) - self.mean) / self.std
+        hidden = np.maximum(x @ self.w1 + self.b1, 0.0)
+        return hidden @ self.w2 + self.b2
+
+    def predict_proba(self, features: np.ndarray) -> np.ndarray:
+        """Class probabilities, shape (n_samples, n_classes)."""
+        logits = self._logits(features)
+        logits -= logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """Most likely class label per sample."""
+        return self.classes_[np.argmax(self._logits(features), axis=1)]
+
+    def save(self, path: str):
+        """Write the weights to an .npz file."""
+        np.savez(path, classes=self.classes_.astype(str), mean=self.mean, std=self.std,
+                 w1=self.w1, b1=self.b1, w2=self.w2, b2=self.b2)
+
+    @classmethod
+    def load(cls, path: str) -> 'DistilledClassifier':
+        """Load weights written by save()."""
+        with np.load(path) as data:
+            return cls(data['classes'], data['mean'], data['std'], data['w1'], data['b1'], data['w2'], data['b2'])
+
+
+def distill(forest, features: np.ndarray, hidden: int = 64, epochs: int = 600, learning_rate: float = 0.01,
+            augment: int = 4, noise: float = 0.01, random_state: int = 42) -> DistilledClassifier:
+    """
+    Train a DistilledClassifier to reproduce the forest's predict_proba.
+
+    The training set is augmented with jittered copies of every sample so the
+    student also learns the forest's behaviour between the recorded poses.
+    Training is full-batch Adam on the cross-entropy against the forest's
+    soft labels.
+
+    Args:
+        forest: Fitted teacher classifier with predict_proba
+        features: Teacher input features, shape (n_samples, 42)
+        hidden: Hidden layer width
+        epochs: Training epochs
+        learning_rate: Adam learning rate
+        augment: Jittered copies per sample
+        noise: Standard deviation of the jitter
+        random_state: Seed for reproducible training
+
+    Returns:
+        Trained student
+    """
+    rng = np.random.default_rng(random_state)
+    jittered = [features + rng.normal(0.0, noise, features.shape) for _ in range(augment)]
+    inputs = np.clip(np.concatenate([features] + jittered), 0.0, None)
+    targets = forest.predict_proba(inputs).astype(np.float32)
+
+    x = engineered_features(inputs)
+    mean = x.mean(axis=0)
+    std = x.std(axis=0) + 1e-6
+    x = (x - mean) / std
+
+    params = {
+        'w1': rng.normal(0.0, np.sqrt(2.0 / x.shape[1]), (x.shape[1], hidden)).astype(np.float32),
+        'b1': np.zeros(hidden, dtype=np.float32),
+        'w2': rng.normal(0.0, np.sqrt(2.0 / hidden), (hidden, targets.shape[1])).astype(np.float32),
+        'b2': np.zeros(targets.shape[1], dtype=np.float32),
+    }
+    moments = {name: (np.zeros_like(value), np.zeros_like(value)) for name, value in params.items()}
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+
+    for step in range(1, epochs + 1):
+        pre_hidden = x @ params['w1'] + params['b1']
+        hidden_out = np.maximum(pre_hidden, 0.0)
+        logits = hidden_out @ params['w2'] + params['b2']
+        logits -= logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+
+        grad_logits = (probabilities - targets) / len(x)
+        grad_hidden = (grad_logits @ params['w2'].T) * (pre_hidden > 0)
+        grads = {
+            'w2': hidden_out.T @ grad_logits,
+            'b2': grad_logits.sum(axis=0),
+            'w1': x.T @ grad_hidden,
+            'b1': grad_hidden.sum(axis=0),
+        }
+        for name, grad in grads.items():
+            m, v = moments[name]
+            m[:] = beta1 * m + (1 - beta1) * grad
+            v[:] = beta2 * v + (1 - beta2) * grad * grad
+            m_hat = m / (1 - beta1 ** step)
+            v_hat = v / (1 - beta2 ** step)
+            params[name] -= learning_rate * m_hat / (np.sqrt(v_hat) + eps)
+
+    return DistilledClassifier(forest.classes_, mean, std, params['w1'], params['b1'], params['w2'], params['b2'])
+
+
+def evaluate_distillation(forest, student, features: np.ndarray, labels: Optional[np.ndarray] = None,
+                          noise: float = 0.01, jitter_copies: int = 4, repeats: int = 200,
+                          random_state: int = 1234) -> Dict:
+    """
+    Compare the student with its teacher.
+
+    For an honest number, ``features`` must be held out from both models and
+    contain no copies of training rows (see train_sign_model.duplicate_groups).
+    Agreement is also measured on jittered copies of them, drawn with a
+    different seed than the training augmentation, so the student has never
+    seen them.
+
+    Args:
+        forest: Teacher classifier
+        student: Distilled classifier
+        features: Held-out evaluation features
+        labels: True labels of ``features``, for accuracy against the ground truth
+        noise: Standard deviation of the evaluation jitter
+        jitter_copies: Jittered copies per evaluation sample
+        repeats: Timed single-sample calls per model
+        random_state: Seed of the evaluation jitter
+
+    Returns:
+        Dictionary with agreement, accuracies, per-sample latencies and speedup
+    """
+    agreement = float(np.mean(forest.predict(features) == student.predict(features)))
+    rng = np.random.default_rng(random_state)
+    jittered = np.clip(np.concatenate([features + rng.normal(0.0, noise, features.shape)
+                                       for _ in range(jitter_copies)]), 0.0, None)
+    jittered_agreement = float(np.mean(forest.predict(jittered) == student.predict(jittered)))
+    forest_ms = measure_latency(forest, features[0], repeats)
+    student_ms = measure_latency(student, features[0], repeats)
+    accuracies = {}
+    if labels is not None:
+        accuracies = {
+            'forest_accuracy': round(float(np.mean(forest.predict(features) == labels)), 4),
+            'distilled_accuracy': round(float(np.mean(student.predict(features) == labels)), 4)
+        }
+    return {
+        'samples': len(features),
+        'agreement': round(agreement, 4),
+        'jittered_agreement': round(jittered_agreement, 4),
+        **accuracies,
+        'forest_predict_ms': round(forest_ms, 4),
+        'distilled_predict_ms': round(student_ms, 4),
+        'speedup': round(forest_ms / student_ms, 1) if student_ms else None
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Distill the sign Random Forest into a small NumPy network.')
+    parser.add_argument('--data', default=DATA_PATH, help='data.pickle-style training data')
+    parser.add_argument('--model', default=os.path.join(MODEL_DIR, 'model.p'), help='Teacher model (model.p layout)')
+    parser.add_argument('--output', default=DISTILLED_MODEL_PATH, help='Output .npz file')
+    parser.add_argument('--hidden', type=int, default=64, help='Hidden layer width')
+    args = parser.parse_args()
+
+    features, labels = load_dataset(args.data)
+    with open(args.model, 'rb') as f:
+        teacher = pickle.load(f)['model']
+    teacher.set_params(n_jobs=1)
+
+    # Exact copies would leak across the split, so only unique poses are split
+    features, unique_index = np.unique(features, axis=0, return_index=True)
+    labels = labels[unique_index]
+
+    from sklearn.base import clone
+    from sklearn.model_selection import train_test_split
+    train_index, test_index = train_test_split(np.arange(len(features)), test_size=0.2, stratify=labels, random_state=42)
+
+    # The shipped teacher has seen every row of data.pickle, so the evaluation uses a
+    # copy of it retrained on the training split: the held-out rows are new to both models
+    eval_teacher = clone(teacher).set_params(n_jobs=-1, random_state=42).fit(features[train_index], labels[train_index])
+    eval_teacher.set_params(n_jobs=1)
+    eval_student = distill(eval_teacher, features[train_index], hidden=args.hidden)
+    report = evaluate_distillation(eval_teacher, eval_student, features[test_index], labels[test_index])
+    print(f"📊 Held-out ({report['samples']} unique poses): agreement {report['agreement']:.2%}, "
+          f"on jittered poses {report['jittered_agreement']:.2%}; accuracy forest {report['forest_accuracy']:.2%}, "
+          f"distilled {report['distilled_accuracy']:.2%}")
+    print(f"⏱️ Forest {report['forest_predict_ms']} ms, distilled {report['distilled_predict_ms']} ms, "
+          f"{report['speedup']}x faster")
+
+    # The shipped student is distilled from the real teacher on all unique poses
+    student = distill(teacher, features, hidden=args.hidden)
+    student.save(args.output)
+    print(f"✅ Distilled model saved to '{args.output}'")
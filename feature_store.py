@@ -0,0 +1,253 @@
+import argparse
+import json
+import os
+import pickle
+import tempfile
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Store layout (one directory):
+#   features.npy    float32 [count, dim]
+#   labels.npy      int32   [count] (index into the class list)
+#   class_rows.npy  int64   row numbers grouped by class
+#   index.json      dim, count, class names and each class's [start, end)
+#                   range inside class_rows.npy
+# The .npy files are written with a fixed 128-byte header so appending rows
+# only rewrites the shape in place. index.json is replaced last and its
+# count is authoritative, so readers never see a half-finished append.
+FEATURES_FILE = 'features.npy'
+LABELS_FILE = 'labels.npy'
+CLASS_ROWS_FILE = 'class_rows.npy'
+INDEX_FILE = 'index.json'
+NPY_HEADER_SIZE = 128
+STORE_VERSION = 1
+
+
+def _write_npy_header(f, dtype: np.dtype, shape: Tuple[int, ...]):
+    """Write a version 1.0 .npy header padded to NPY_HEADER_SIZE bytes."""
+    header = repr({'descr': np.dtype(dtype).str, 'fortran_order': False, 'shape': tuple(shape)})
+    header_len = NPY_HEADER_SIZE - 10
+    if len(header) + 1 > header_len:
+        raise ValueError(f"Shape {shape} does not fit in the fixed .npy header")
+    f.seek(0)
+    f.write(b'\x93NUMPY\x01\x00')
+    f.write(header_len.to_bytes(2, 'little'))
+    f.write(header.ljust(header_len - 1).encode('latin1') + b'\n')
+
+
+class FeatureStore:
+    def __init__(self, root: str):
+        """
+        Open an existing feature store.
+
+        Features and labels are memory-mapped, so opening a store costs the
+        same regardless of its size and only the rows actually used are read.
+
+        Args:
+            root: Store directory
+        """
+        self.root = root
+        with open(os.path.join(root, INDEX_FILE)) as f:
+            self.index = json.load(f)
+        self.dim = self.index['dim']
+        self.classes = self.index['classes']
+        self._class_ids = {name: i for i, name in enumerate(self.classes)}
+        self._open_arrays()
+
+    def _open_arrays(self):
+        count = self.index['count']
+        if count:
+            self.features = np.load(os.path.join(self.root, FEATURES_FILE), mmap_mode='r')[:count]
+            self.labels = np.load(os.path.join(self.root, LABELS_FILE), mmap_mode='r')[:count]
+            self.class_rows = np.load(os.path.join(self.root, CLASS_ROWS_FILE), mmap_mode='r')
+        else:
+            self.features = np.zeros((0, self.dim), dtype=np.float32)
+            self.labels = np.zeros(0, dtype=np.int32)
+            self.class_rows = np.zeros(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self.index['count']
+
+    @classmethod
+    def create(cls, root: str, dim: int) -> 'FeatureStore':
+        """
+        Create an empty store.
+
+        Args:
+            root: Store directory (created if missing)
+            dim: Feature dimension
+
+        Returns:
+            The new store
+        """
+        os.makedirs(root, exist_ok=True)
+        with open(os.path.join(root, FEATURES_FILE), 'wb') as f:
+            _write_npy_header(f, np.float32, (0, dim))
+        with open(os.path.join(root, LABELS_FILE), 'wb') as f:
+            _write_npy_header(f, np.int32, (0,))
+        np.save(os.path.join(root, CLASS_ROWS_FILE), np.zeros(0, dtype=np.int64))
+        _write_index(root, {'version': STORE_VERSION, 'dim': dim, 'count': 0, 'classes': [], 'class_offsets': {}})
+        return cls(root)
+
+    @classmethod
+    def from_pickle(cls, pickle_path: str, root: str) -> 'FeatureStore':
+        """
+        Build a store from a data.pickle-style file.
+
+        Args:
+            pickle_path: Pickle with 'data' and 'labels' lists
+            root: Store directory
+
+        Returns:
+            The new store
+        """
+        with open(pickle_path, 'rb') as f:
+            data_dict = pickle.load(f)
+        features = np.asarray(data_dict['data'], dtype=np.float32)
+        store = cls.create(root, features.shape[1])
+        store.append(features, [str(label) for label in data_dict['labels']])
+        print(f"💾 Stored {len(store)} samples from '{pickle_path}' in '{root}'")
+        return store
+
+    def append(self, features: np.ndarray, labels: Sequence[str]):
+        """
+        Append samples without rewriting existing rows.
+
+        Args:
+            features: Array of shape (n, dim)
+            labels: Class name per sample
+        """
+        features = np.asarray(features, dtype=np.float32).reshape(-1, self.dim)
+        if len(features) != len(labels):
+            raise ValueError("features and labels must have the same length")
+
+        for name in labels:
+            if name not in self._class_ids:
+                self._class_ids[name] = len(self.classes)
+                self.classes.append(name)
+        label_ids = np.asarray([self._class_ids[name] for name in labels], dtype=np.int32)
+
+        # Release our own maps before resizing the files they point into
+        self.features = self.labels = self.class_rows = None
+
+        count = self.index['count']
+        new_count = count + len(features)
+        for filename, rows, dtype, shape in ((FEATURES_FILE, features, np.float32, (new_count, self.dim)),
+                                             (LABELS_FILE, label_ids, np.int32, (new_count,))):
+            with open(os.path.join(self.root, filename), 'r+b') as f:
+                # Drop rows of an interrupted earlier append, then add the new ones
+                row_bytes = np.dtype(dtype).itemsize * (self.dim if filename == FEATURES_FILE else 1)
+                f.truncate(NPY_HEADER_SIZE + count * row_bytes)
+                f.seek(0, os.SEEK_END)
+                f.write(np.ascontiguousarray(rows).tobytes())
+                _write_npy_header(f, dtype, shape)
+
+        # Regroup row numbers by class; only the small label column is read
+        all_labels = np.load(os.path.join(self.root, LABELS_FILE), mmap_mode='r')[:new_count]
+        class_rows = np.argsort(all_labels, kind='stable').astype(np.int64)
+        ends = np.cumsum(np.bincount(all_labels, minlength=len(self.classes)))
+        starts = ends - np.bincount(all_labels, minlength=len(self.classes))
+        fd, temp_path = tempfile.mkstemp(dir=self.root, prefix='.class_rows-', suffix='.npy')
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, class_rows)
+        os.replace(temp_path, os.path.join(self.root, CLASS_ROWS_FILE))
+
+        self.index.update({
+            'count': new_count,
+            'classes': self.classes,
+            'class_offsets': {name: [int(starts[i]), int(ends[i])] for i, name in enumerate(self.classes)}
+        })
+        _write_index(self.root, self.index)
+        self._open_arrays()
+
+    def class_counts(self) -> Dict[str, int]:
+        """Number of samples per class, from the index alone."""
+        return {name: end - start for name, (start, end) in self.index['class_offsets'].items()}
+
+    def sample_class(self, name: str, n: Optional[int] = None, seed: Optional[int] = None) -> np.ndarray:
+        """
+        Read samples of one class without touching the other rows.
+
+        Args:
+            name: Class name
+            n: Number of samples (all of the class if None or larger than the class)
+            seed: Random seed for the selection
+
+        Returns:
+            Array of shape (n, dim)
+        """
+        start, end = self.index['class_offsets'][name]
+        rows = np.asarray(self.class_rows[start:end])
+        if n is not None and n < len(rows):
+            rows = np.random.default_rng(seed).choice(rows, size=n, replace=False)
+        return np.asarray(self.features[np.sort(rows)])
+
+    def iter_batches(self, batch_size: int = 1024, shuffle: bool = False,
+                     seed: Optional[int] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Stream the store in batches for out-of-core training.
+
+        With shuffle every row index is permuted across the whole store, so
+        each batch is a uniform sample of all classes even though converted
+        data is stored grouped by class. A batch's indices are read in
+        sorted order, which keeps the memory-mapped reads mostly forward,
+        and then permuted again in memory.
+
+        Args:
+            batch_size: Rows per batch
+            shuffle: Sample rows in a random order across the whole store
+            seed: Random seed
+
+        Yields:
+            Tuples of (features, label names)
+        """
+        count = len(self)
+        rng = np.random.default_rng(seed)
+        order = rng.permutation(count) if shuffle else None
+        class_names = np.asarray(self.classes)
+        for start in range(0, count, batch_size):
+            if shuffle:
+                rows = np.sort(order[start:start + batch_size])
+                features, labels = np.asarray(self.features[rows]), np.asarray(self.labels[rows])
+                shuffled = rng.permutation(len(rows))
+                features, labels = features[shuffled], labels[shuffled]
+            else:
+                features = np.asarray(self.features[start:start + batch_size])
+                labels = np.asarray(self.labels[start:start + batch_size])
+            yield features, class_names[labels]
+
+    def load_all(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Read the whole store into memory.
+
+        Returns:
+            Tuple of (features, label names)
+        """
+        return np.asarray(self.features), np.asarray(self.classes)[np.asarray(self.labels)]
+
+
+def _write_index(root: str, index: Dict):
+    fd, temp_path = tempfile.mkstemp(dir=root, prefix='.index-')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(index, f, indent=2)
+    os.replace(temp_path, os.path.join(root, INDEX_FILE))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Manage memory-mapped feature stores.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    convert_parser = commands.add_parser('convert', help='Build a store from data.pickle')
+    convert_parser.add_argument('pickle_path')
+    convert_parser.add_argument('root')
+    info_parser = commands.add_parser('info', help='Show store size and class counts')
+    info_parser.add_argument('root')
+    args = parser.parse_args()
+
+    if args.command == 'convert':
+        FeatureStore.from_pickle(args.pickle_path, args.root)
+    else:
+        store = FeatureStore(args.root)
+        print(f"📚 {len(store)} samples, {store.dim} features, {len(store.classes)} classes")
+        for class_name, class_count in store.class_counts().items():
+            print(f"  {class_name}: {class_count}")
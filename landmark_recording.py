@@ -0,0 +1,352 @@
+import argparse
+import json
+import os
+import pickle
+import struct
+import tempfile
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# A recording is a data file of appended chunks plus a small JSON index
+# (<path>.idx) listing where every chunk starts. Chunk layout:
+#   header      '<4sII' magic, frame count, hand count (padded to 16 bytes)
+#   timestamps  float64[frames]
+#   hand counts uint8[frames] (padded to a multiple of 8 bytes)
+#   landmarks   float32[hands, 21, 3] (padded to a multiple of 8 bytes)
+# Every section is aligned, so the file can be memory-mapped and any chunk
+# viewed in place without reading the rest.
+CHUNK_MAGIC = b'SLRC'
+CHUNK_HEADER = struct.Struct('<4sII')
+CHUNK_HEADER_SIZE = 16
+RECORDING_VERSION = 1
+NUM_LANDMARKS = 21
+
+
+def _pad8(size: int) -> int:
+    return (size + 7) // 8 * 8
+
+
+def index_path_for(path: str) -> str:
+    """Path of the index file that belongs to a recording."""
+    return path + '.idx'
+
+
+class LandmarkRecorder:
+    def __init__(self, path: str, chunk_frames: int = 256, labels: bool = False):
+        """
+        Append-only writer for per-frame hand landmarks.
+
+        Frames are buffered in memory and written one chunk at a time. The
+        index is rewritten atomically after every chunk, so a recording that
+        is cut short is still readable up to its last complete chunk.
+
+        Args:
+            path: Recording data file (the index goes to <path>.idx)
+            chunk_frames: Frames per chunk
+            labels: Whether frames carry a label (used by the data.pickle converter)
+        """
+        self.path = path
+        self.chunk_frames = chunk_frames
+        self._lock = threading.Lock()
+        self._timestamps = []
+        self._hand_counts = []
+        self._hands = []
+        self._labels = [] if labels else None
+        self._closed = False
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(index_path_for(path)):
+            with open(index_path_for(path)) as f:
+                self.index = json.load(f)
+        else:
+            self.index = {'version': RECORDING_VERSION, 'landmarks': NUM_LANDMARKS, 'frames': 0, 'hands': 0, 'chunks': []}
+            open(path, 'wb').close()
+        if labels:
+            self.index.setdefault('labels', [])
+
+    def append(self, timestamp: float, landmarks_list: List, label: Optional[str] = None) -> bool:
+        """
+        Record one frame.
+
+        Args:
+            timestamp: Frame time in seconds
+            landmarks_list: Per-hand landmarks (21 [x, y, z] values each), possibly empty
+            label: Optional frame label
+
+        Returns:
+            False if the recorder was already closed and the frame was not recorded
+        """
+        hands = [np.asarray(landmarks, dtype=np.float32)[:NUM_LANDMARKS, :3] for landmarks in landmarks_list]
+        with self._lock:
+            # A frame thread may still hold the recorder after close(); its frame
+            # would sit in the buffer after the final flush and never be written
+            if self._closed:
+                return False
+            self._timestamps.append(timestamp)
+            self._hand_counts.append(len(hands))
+            self._hands.extend(hands)
+            if self._labels is not None:
+                self._labels.append(label)
+            if len(self._timestamps) >= self.chunk_frames:
+                self._flush_chunk()
+        return True
+
+    def _flush_chunk(self):
+        """Write buffered frames as one chunk and update the index."""
+        if not self._timestamps:
+            return
+
+        frames = len(self._timestamps)
+        hand_count = len(self._hands)
+        timestamps = np.asarray(self._timestamps, dtype=np.float64)
+        counts = np.zeros(_pad8(frames), dtype=np.uint8)
+        counts[:frames] = self._hand_counts
+        if self._hands:
+            landmarks = np.stack(self._hands).astype(np.float32)
+        else:
+            landmarks = np.zeros((0, NUM_LANDMARKS, 3), dtype=np.float32)
+
+        header = CHUNK_HEADER.pack(CHUNK_MAGIC, frames, hand_count).ljust(CHUNK_HEADER_SIZE, b'\0')
+        with open(self.path, 'ab') as f:
+            offset = f.tell()
+            f.write(header)
+            f.write(timestamps.tobytes())
+            f.write(counts.tobytes())
+            f.write(landmarks.tobytes())
+            f.write(b'\0' * (_pad8(landmarks.nbytes) - landmarks.nbytes))  # Keep the next chunk aligned
+
+        self.index['chunks'].append({
+            'offset': offset,
+            'frames': frames,
+            'hands': hand_count,
+            'first_frame': self.index['frames'],
+            'start_time': float(timestamps[0]),
+            'end_time': float(timestamps[-1])
+        })
+        self.index['frames'] += frames
+        self.index['hands'] += hand_count
+        if self._labels is not None:
+            self.index['labels'].extend(self._labels)
+            self._labels = []
+        self._write_index()
+
+        self._timestamps = []
+        self._hand_counts = []
+        self._hands = []
+
+    def _write_index(self):
+        index_path = index_path_for(self.path)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(index_path)), prefix='.idx-')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self.index, f)
+        os.replace(temp_path, index_path)
+
+    def close(self):
+        """Write any buffered frames; later append() calls are rejected."""
+        with self._lock:
+            self._flush_chunk()
+            self._closed = True
+
+
+class LandmarkRecording:
+    def __init__(self, path: str):
+        """
+        Memory-mapped reader for a recording.
+
+        Only the index is parsed up front. Frames are served as views into the
+        mapped file, so slicing a long recording touches only the chunks it
+        needs.
+
+        Args:
+            path: Recording data file
+        """
+        self.path = path
+        with open(index_path_for(path)) as f:
+            self.index = json.load(f)
+        self.chunks = self.index['chunks']
+        self.labels = self.index.get('labels')
+        self._first_frames = np.asarray([chunk['first_frame'] for chunk in self.chunks], dtype=np.int64)
+        self._data = np.memmap(path, dtype=np.uint8, mode='r') if self.chunks else None
+        self._views = {}
+
+    def __len__(self) -> int:
+        return self.index['frames']
+
+    @property
+    def duration(self) -> float:
+        """Seconds between the first and the last frame."""
+        if not self.chunks:
+            return 0.0
+        return self.chunks[-1]['end_time'] - self.chunks[0]['start_time']
+
+    def _chunk_views(self, chunk_number: int):
+        """Timestamps, per-frame hand offsets and landmarks of one chunk (cached views)."""
+        views = self._views.get(chunk_number)
+        if views is None:
+            chunk = self.chunks[chunk_number]
+            frames, hands = chunk['frames'], chunk['hands']
+            offset = chunk['offset'] + CHUNK_HEADER_SIZE
+            timestamps = np.ndarray((frames,), dtype=np.float64, buffer=self._data, offset=offset)
+            offset += frames * 8
+            counts = np.ndarray((frames,), dtype=np.uint8, buffer=self._data, offset=offset)
+            offset += _pad8(frames)
+            landmarks = np.ndarray((hands, NUM_LANDMARKS, 3), dtype=np.float32, buffer=self._data, offset=offset)
+            starts = np.zeros(frames + 1, dtype=np.int64)
+            np.cumsum(counts, out=starts[1:])
+            views = (timestamps, starts, landmarks)
+            self._views[chunk_number] = views
+        return views
+
+    def frame(self, index: int) -> Tuple[float, np.ndarray]:
+        """
+        Get one frame.
+
+        Args:
+            index: Frame number
+
+        Returns:
+            Tuple of (timestamp, landmarks of shape (hands, 21, 3))
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Frame {index} out of range")
+        chunk_number = int(np.searchsorted(self._first_frames, index, side='right')) - 1
+        timestamps, starts, landmarks = self._chunk_views(chunk_number)
+        local = index - self.chunks[chunk_number]['first_frame']
+        return float(timestamps[local]), landmarks[starts[local]:starts[local + 1]]
+
+    def frames(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[float, np.ndarray]]:
+        """
+        Iterate over a range of frames.
+
+        Args:
+            start: First frame
+            stop: Frame to stop before (defaults to the end)
+
+        Yields:
+            Tuples of (timestamp, landmarks)
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        index = start
+        while index < stop:
+            chunk_number = int(np.searchsorted(self._first_frames, index, side='right')) - 1
+            timestamps, starts, landmarks = self._chunk_views(chunk_number)
+            first = self.chunks[chunk_number]['first_frame']
+            last = min(stop, first + self.chunks[chunk_number]['frames'])
+            for local in range(index - first, last - first):
+                yield float(timestamps[local]), landmarks[starts[local]:starts[local + 1]]
+            index = last
+
+    def __getitem__(self, index: int) -> Tuple[float, np.ndarray]:
+        return self.frame(index)
+
+
+def replay(recording: LandmarkRecording, recognizer, start: int = 0, stop: Optional[int] = None) -> Dict:
+    """
+    Feed a recording through the recognizer's landmark analysis and stability logic.
+
+    MediaPipe is skipped entirely and the recorded timestamps drive the
+    stability cooldown, so replay runs as fast as classification allows.
+
+    Args:
+        recording: Recording to replay
+        recognizer: ReliableSignRecognizer instance
+        start: First frame
+        stop: Frame to stop before
+
+    Returns:
+        Dictionary with recognized events and throughput statistics
+    """
+    recognizer.prediction_history.clear()
+    recognizer.last_recognition_time = 0
+    for buffer in recognizer.motion_buffers:
+        buffer.reset()
+
+    events = []
+    frames = 0
+    first_time = last_time = None
+    started = time.perf_counter()
+    for timestamp, hands in recording.frames(start, stop):
+        gesture, translation = recognizer.process_landmarks(list(hands), timestamp=timestamp)
+        if gesture:
+            events.append({'frame': start + frames, 'time': timestamp, 'gesture': gesture, 'translation': translation})
+        if first_time is None:
+            first_time = timestamp
+        last_time = timestamp
+        frames += 1
+    elapsed = time.perf_counter() - started
+
+    recorded = (last_time - first_time) if frames > 1 else 0.0
+    return {
+        'frames': frames,
+        'events': events,
+        'elapsed_s': round(elapsed, 3),
+        'frames_per_second': round(frames / elapsed, 1) if elapsed else None,
+        'realtime_factor': round(recorded / elapsed, 1) if elapsed else None
+    }
+
+
+def convert_data_pickle(pickle_path: str, output_path: str, fps: float = 30.0, chunk_frames: int = 256) -> Dict:
+    """
+    Convert data.pickle samples into a recording, one single-hand frame per sample.
+
+    The 42 min-normalized x/y values become landmark x and y with z set to 0.
+    Re-normalizing them gives back the same feature vector, so replaying the
+    recording classifies exactly the training samples. Sample labels are kept
+    in the index.
+
+    Args:
+        pickle_path: data.pickle-style file
+        output_path: Recording data file
+        fps: Frame rate used for the synthetic timestamps
+        chunk_frames: Frames per chunk
+
+    Returns:
+        Dictionary with the number of frames written
+    """
+    with open(pickle_path, 'rb') as f:
+        data_dict = pickle.load(f)
+
+    for path in (output_path, index_path_for(output_path)):
+        if os.path.exists(path):
+            os.remove(path)
+
+    recorder = LandmarkRecorder(output_path, chunk_frames=chunk_frames, labels=True)
+    for i, (sample, label) in enumerate(zip(data_dict['data'], data_dict['labels'])):
+        hand = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+        hand[:, :2] = np.asarray(sample, dtype=np.float32).reshape(NUM_LANDMARKS, 2)
+        recorder.append(i / fps, [hand], label=str(label))
+    recorder.close()
+
+    print(f"💾 Converted {len(data_dict['data'])} samples into '{output_path}'")
+    return {'frames': len(data_dict['data']), 'output_path': output_path}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Convert and replay landmark recordings.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    convert_parser = commands.add_parser('convert', help='Convert data.pickle into a recording')
+    convert_parser.add_argument('pickle_path')
+    convert_parser.add_argument('output_path')
+    replay_parser = commands.add_parser('replay', help='Replay a recording through the recognizer')
+    replay_parser.add_argument('path')
+    replay_parser.add_argument('--model', help='Model file (model.p layout)')
+    replay_parser.add_argument('--start', type=int, default=0)
+    replay_parser.add_argument('--stop', type=int)
+    args = parser.parse_args()
+
+    if args.command == 'convert':
+        convert_data_pickle(args.pickle_path, args.output_path)
+    else:
+        from reliable_sign_recognition import ReliableSignRecognizer
+        sign_recognizer = ReliableSignRecognizer(model_path=args.model, adaptive_quality=False)
+        result = replay(LandmarkRecording(args.path), sign_recognizer, args.start, args.stop)
+        for event in result['events']:
+            print(f"🎯 frame {event['frame']} ({event['time']:.2f}s): {event['gesture']} -> {event['translation']}")
+        print(f"📊 {result['frames']} frames in {result['elapsed_s']}s "
+              f"({result['frames_per_second']} FPS, {result['realtime_factor']}x real time)")
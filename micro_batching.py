@@ -0,0 +1,250 @@
+import argparse
+import json
+import os
+import pickle
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from train_sign_model import DATA_PATH, MODEL_DIR, load_dataset
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = [0.5, 1, 2, 5, 10, 20, 50, 100]
+
+
+class MicroBatchClassifier:
+    def __init__(self, model=None, max_batch_size: int = 32, max_wait: float = 0.002, history: int = 2000):
+        """
+        Classification service shared by all streams that batches concurrent requests.
+
+        Each caller submits one feature vector and gets a Future. A worker
+        thread takes the first waiting vector, keeps collecting until
+        ``max_wait`` has passed since it arrived or ``max_batch_size`` vectors
+        are waiting, then runs one predict() per model for the whole batch.
+        A larger window means bigger batches and more throughput under load,
+        but adds up to ``max_wait`` to every request when traffic is light.
+
+        A predict() call that finds no other request in flight skips the
+        queue and runs on the caller's thread, so a single stream pays
+        neither the thread handoff nor the window.
+
+        Args:
+            model: Default classifier used when submit() gets no model
+            max_batch_size: Most vectors per batched predict()
+            max_wait: Seconds the first vector of a batch may wait for others
+            history: Latency samples kept for percentiles
+        """
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._latencies = deque(maxlen=history)
+        self.latency_histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.batch_size_histogram = {}
+        self.requests = 0
+        self.batches = 0
+        self.errors = 0
+        self.inline = 0
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        self._stopped = False
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def set_model(self, model):
+        """Replace the default classifier; batches already collected keep their model."""
+        self.model = model
+
+    def submit(self, feature_vector: np.ndarray, model=None) -> Future:
+        """
+        Queue one feature vector for classification. Never blocks.
+
+        Args:
+            feature_vector: 1D feature vector
+            model: Classifier to use (defaults to the service's model). Callers
+                that snapshot the model for hot-swapping pass it here.
+
+        Returns:
+            Future resolving to the raw model prediction for the vector
+        """
+        future = Future()
+        self.requests += 1
+        self._queue.put((np.asarray(feature_vector).ravel(), model, future, time.perf_counter()))
+        return future
+
+    def predict(self, feature_vector: np.ndarray, model=None, timeout: Optional[float] = 1.0):
+        """
+        Classify one feature vector and wait for the result.
+
+        Args:
+            feature_vector: 1D feature vector
+            model: Classifier to use (defaults to the service's model)
+            timeout: Seconds to wait before giving up
+
+        Returns:
+            Raw model prediction for the vector
+        """
+        with self._in_flight_lock:
+            self._in_flight += 1
+            alone = self._in_flight == 1
+        try:
+            if not alone:
+                return self.submit(feature_vector, model).result(timeout=timeout)
+
+            # Nobody to batch with: classify right here
+            start = time.perf_counter()
+            self.requests += 1
+            self.inline += 1
+            model = model if model is not None else self.model
+            prediction = model.predict(np.asarray(feature_vector).reshape(1, -1))[0]
+            self._record_latency(time.perf_counter() - start)
+            self._record_batch(1)
+            return prediction
+        finally:
+            with self._in_flight_lock:
+                self._in_flight -= 1
+
+    def _run(self):
+        """Worker loop: collect a batch within the time window, then classify it."""
+        while not self._stopped:
+            try:
+                batch = [self._queue.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+            deadline = batch[0][3] + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._classify(batch)
+
+    def _classify(self, batch: List[tuple]):
+        # Requests made before and after a hot-swap may share a batch, so group by model
+        groups = {}
+        for item in batch:
+            model = item[1] if item[1] is not None else self.model
+            groups.setdefault(id(model), (model, []))[1].append(item)
+
+        for model, items in groups.values():
+            try:
+                predictions = model.predict(np.vstack([item[0] for item in items]))
+            except Exception as e:
+                self.errors += len(items)
+                for item in items:
+                    item[2].set_exception(e)
+                continue
+            done = time.perf_counter()
+            for item, prediction in zip(items, predictions):
+                self._record_latency(done - item[3])
+                item[2].set_result(prediction)
+
+        self._record_batch(len(batch))
+
+    def _record_batch(self, size: int):
+        self.batches += 1
+        self.batch_size_histogram[size] = self.batch_size_histogram.get(size, 0) + 1
+
+    def _record_latency(self, latency: float):
+        latency_ms = latency * 1000
+        self._latencies.append(latency_ms)
+        bucket = next((i for i, bound in enumerate(LATENCY_BUCKETS_MS) if latency_ms <= bound), len(LATENCY_BUCKETS_MS))
+        self.latency_histogram[bucket] += 1
+
+    def stop(self):
+        """Stop the worker thread."""
+        self._stopped = True
+
+    def reset_stats(self):
+        """Clear the histograms and counters, e.g. after changing the window."""
+        self._latencies.clear()
+        self.latency_histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.batch_size_histogram = {}
+        self.requests = self.batches = self.errors = self.inline = 0
+
+    def get_stats(self) -> Dict:
+        """
+        Get batching statistics for tuning the window.
+
+        Returns:
+            Dictionary with settings, counts, latency percentiles and both histograms
+        """
+        latencies = np.asarray(self._latencies)
+        labels = [f'<={bound}ms' for bound in LATENCY_BUCKETS_MS] + [f'>{LATENCY_BUCKETS_MS[-1]}ms']
+        sizes = self.batch_size_histogram
+        served = sum(size * count for size, count in sizes.items())
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'requests': self.requests,
+            'batches': self.batches,
+            'errors': self.errors,
+            'inline': self.inline,
+            'queued': self._queue.qsize(),
+            'avg_batch_size': round(served / self.batches, 2) if self.batches else None,
+            'latency_ms': {
+                f'p{p}': round(float(np.percentile(latencies, p)), 3) if len(latencies) else None
+                for p in (50, 95, 99)
+            },
+            'latency_histogram': dict(zip(labels, self.latency_histogram)),
+            'batch_size_histogram': {str(size): sizes[size] for size in sorted(sizes)}
+        }
+
+
+def benchmark(model, vectors: np.ndarray, streams: int = 8, requests_per_stream: int = 200,
+              max_batch_size: int = 32, max_wait: float = 0.002) -> Dict:
+    """
+    Compare per-stream predict() calls with the shared micro-batching service.
+
+    Args:
+        model: Fitted classifier
+        vectors: Feature vectors to sample requests from
+        streams: Concurrent caller threads
+        requests_per_stream: Requests issued by each thread
+        max_batch_size: Service batch size limit
+        max_wait: Service time window in seconds
+
+    Returns:
+        Dictionary with requests per second for both modes and the service statistics
+    """
+    def run(call) -> float:
+        def stream(offset):
+            for i in range(requests_per_stream):
+                call(vectors[(offset + i) % len(vectors)])
+        threads = [threading.Thread(target=stream, args=(k * 37,)) for k in range(streams)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return streams * requests_per_stream / (time.perf_counter() - start)
+
+    direct_rps = run(lambda vector: model.predict(vector.reshape(1, -1)))
+    service = MicroBatchClassifier(model, max_batch_size=max_batch_size, max_wait=max_wait)
+    batched_rps = run(service.predict)
+    service.stop()
+    return {'streams': streams, 'direct_rps': round(direct_rps), 'batched_rps': round(batched_rps),
+            'service': service.get_stats()}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the micro-batching classifier service.')
+    parser.add_argument('--model', default=os.path.join(MODEL_DIR, 'model.p'), help='Model in the model.p layout')
+    parser.add_argument('--data', default=DATA_PATH, help='Feature vectors to classify')
+    parser.add_argument('--streams', type=int, default=8, help='Concurrent caller threads')
+    parser.add_argument('--max-batch-size', type=int, default=32)
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    args = parser.parse_args()
+
+    with open(args.model, 'rb') as f:
+        forest = pickle.load(f)['model']
+    forest.set_params(n_jobs=1)
+    features, _ = load_dataset(args.data)
+    print(json.dumps(benchmark(forest, features, streams=args.streams, max_batch_size=args.max_batch_size,
+                               max_wait=args.max_wait_ms / 1000), indent=2))
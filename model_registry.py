@@ -0,0 +1,326 @@
+import argparse
+import hashlib
+import json
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+import joblib
+import numpy as np
+
+from distilled_classifier import DistilledClassifier
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REGISTRY_DIR = os.path.join(BASE_DIR, 'models', 'registry')
+ACTIVE_FILE = 'ACTIVE'
+
+
+def _write_atomic(path: str, text: str):
+    """Write a small text file so readers see either the old or the new content."""
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    with os.fdopen(fd, 'w') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+def load_model_file(path: str, backend: str = 'forest'):
+    """
+    Load a classifier from disk.
+
+    Args:
+        path: Model file (model.p layout, or .npz for the distilled backend)
+        backend: 'forest' or 'distilled'
+
+    Returns:
+        Classifier with predict / predict_proba / classes_
+    """
+    if backend == 'distilled':
+        return DistilledClassifier.load(path)
+    return joblib.load(path)['model']
+
+
+class ModelRegistry:
+    def __init__(self, root: str = REGISTRY_DIR):
+        """
+        Versioned model store in a local directory.
+
+        Every version lives in its own vNNNN/ folder with the model file and
+        a meta.json. The ACTIVE file names the version in use and is replaced
+        atomically on promotion, which is what running servers watch.
+
+        Args:
+            root: Registry directory
+        """
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._watcher = None
+        self._stop_watching = threading.Event()
+
+    def list_versions(self) -> List[Dict]:
+        """
+        List registered versions, oldest first.
+
+        Returns:
+            List of version metadata dictionaries
+        """
+        versions = []
+        for name in sorted(os.listdir(self.root)):
+            meta_path = os.path.join(self.root, name, 'meta.json')
+            if name.startswith('v') and os.path.exists(meta_path):
+                with open(meta_path) as f:
+                    versions.append(json.load(f))
+        return versions
+
+    def get(self, version: str) -> Dict:
+        """
+        Get the metadata of one version.
+
+        Args:
+            version: Version name such as 'v0003'
+
+        Returns:
+            Version metadata
+        """
+        meta_path = os.path.join(self.root, version, 'meta.json')
+        if not os.path.exists(meta_path):
+            raise KeyError(f"Unknown model version '{version}'")
+        with open(meta_path) as f:
+            return json.load(f)
+
+    def model_path(self, version: str) -> str:
+        """Path of the model file of a version."""
+        return os.path.join(self.root, version, self.get(version)['filename'])
+
+    def register(self, source_path: str, backend: str = 'forest', notes: str = '') -> str:
+        """
+        Copy a model file into the registry as a new version.
+
+        The version folder is assembled under a temporary name and renamed
+        into place, so a half-written version is never visible.
+
+        Args:
+            source_path: Model file to register
+            backend: 'forest' or 'distilled'
+            notes: Free-form description
+
+        Returns:
+            The new version name
+        """
+        # Fail early on files that cannot be loaded
+        load_model_file(source_path, backend)
+
+        with open(source_path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+
+        existing = [int(meta['version'][1:]) for meta in self.list_versions()]
+        version = f'v{max(existing + [0]) + 1:04d}'
+        filename = 'model.npz' if backend == 'distilled' else 'model.p'
+
+        staging = tempfile.mkdtemp(dir=self.root, prefix='.staging-')
+        shutil.copyfile(source_path, os.path.join(staging, filename))
+        meta = {
+            'version': version,
+            'backend': backend,
+            'filename': filename,
+            'sha256': digest,
+            'source': os.path.abspath(source_path),
+            'notes': notes,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S')
+        }
+        with open(os.path.join(staging, 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.rename(staging, os.path.join(self.root, version))
+
+        print(f"📦 Registered model {version} from '{source_path}'")
+        return version
+
+    def active_version(self) -> Optional[str]:
+        """Name of the active version, or None if nothing was promoted yet."""
+        path = os.path.join(self.root, ACTIVE_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return f.read().strip() or None
+
+    def promote(self, version: str):
+        """
+        Make a version the active one.
+
+        Args:
+            version: Version to activate
+        """
+        self.get(version)  # Validate
+        _write_atomic(os.path.join(self.root, ACTIVE_FILE), version)
+        print(f"🚀 Promoted model {version}")
+
+    def load(self, version: str):
+        """
+        Load the classifier of a version.
+
+        Args:
+            version: Version to load
+
+        Returns:
+            Classifier object
+        """
+        return load_model_file(self.model_path(version), self.get(version)['backend'])
+
+    def watch(self, on_change: Callable[[str, object], None], interval: float = 2.0):
+        """
+        Poll the ACTIVE file in the background and load newly promoted versions.
+
+        Loading happens on the watcher thread, so the callback receives a
+        ready-to-use model and only has to swap a reference.
+
+        Args:
+            on_change: Called with (version, model) after a new version is loaded
+            interval: Seconds between polls
+        """
+        if self._watcher is not None:
+            return
+
+        def run():
+            current = self.active_version()
+            while not self._stop_watching.wait(interval):
+                try:
+                    version = self.active_version()
+                    if version and version != current:
+                        on_change(version, self.load(version))
+                        current = version
+                except Exception as e:
+                    print(f"❌ Error loading promoted model: {e}")
+
+        self._watcher = threading.Thread(target=run, daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        """Stop the background watcher."""
+        self._stop_watching.set()
+        self._watcher = None
+
+
+class ShadowEvaluator:
+    def __init__(self, model, version: str, labels: Dict[str, str], max_queue: int = 256, history: int = 1000):
+        """
+        Score live feature vectors with a candidate model off the critical path.
+
+        The frame loop only does a non-blocking put; when the queue is full
+        the sample is dropped (and counted) instead of slowing the frame down.
+
+        Args:
+            model: Candidate classifier
+            version: Candidate version name
+            labels: Mapping from model class to gesture name
+            max_queue: Samples that may wait for the worker
+            history: Latency samples kept for percentiles
+        """
+        self.model = model
+        self.version = version
+        self.labels = labels
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._candidate_latencies = deque(maxlen=history)
+        self._primary_latencies = deque(maxlen=history)
+        self.submitted = 0
+        self.dropped = 0
+        self.evaluated = 0
+        self.agreements = 0
+        self.started = time.time()
+        self._stopped = False
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, feature_vector: np.ndarray, primary_gesture: Optional[str], primary_latency: Optional[float] = None):
+        """
+        Queue a feature vector scored by the active model. Never blocks.
+
+        Args:
+            feature_vector: Feature vector the active model saw
+            primary_gesture: Gesture the active model returned
+            primary_latency: Active model latency in seconds, if it actually ran
+        """
+        self.submitted += 1
+        if primary_latency is not None:
+            self._primary_latencies.append(primary_latency)
+        try:
+            self._queue.put_nowait((feature_vector, primary_gesture))
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        """Worker loop that scores queued samples with the candidate."""
+        while not self._stopped:
+            try:
+                feature_vector, primary_gesture = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                start = time.perf_counter()
+                prediction = self.model.predict(feature_vector.reshape(1, -1))
+                self._candidate_latencies.append(time.perf_counter() - start)
+                self.evaluated += 1
+                if self.labels.get(str(prediction[0])) == primary_gesture:
+                    self.agreements += 1
+            except Exception as e:
+                print(f"❌ Shadow model {self.version} failed: {e}")
+
+    def stop(self):
+        """Stop the worker thread."""
+        self._stopped = True
+
+    @staticmethod
+    def _percentiles(samples) -> Dict:
+        if not samples:
+            return {'p50_ms': None, 'p95_ms': None}
+        values = np.asarray(samples) * 1000
+        return {'p50_ms': round(float(np.percentile(values, 50)), 3), 'p95_ms': round(float(np.percentile(values, 95)), 3)}
+
+    def get_stats(self) -> Dict:
+        """
+        Get agreement and latency statistics for the promotion decision.
+
+        Returns:
+            Dictionary with counts, agreement rate and latency percentiles
+        """
+        return {
+            'version': self.version,
+            'running_s': round(time.time() - self.started, 1),
+            'submitted': self.submitted,
+            'evaluated': self.evaluated,
+            'dropped': self.dropped,
+            'agreement': round(self.agreements / self.evaluated, 4) if self.evaluated else None,
+            'candidate_latency': self._percentiles(list(self._candidate_latencies)),
+            'active_latency': self._percentiles(list(self._primary_latencies))
+        }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Manage the local sign model registry.')
+    parser.add_argument('--root', default=REGISTRY_DIR, help='Registry directory')
+    commands = parser.add_subparsers(dest='command', required=True)
+    register_parser = commands.add_parser('register', help='Add a model file as a new version')
+    register_parser.add_argument('path')
+    register_parser.add_argument('--backend', default='forest', choices=['forest', 'distilled'])
+    register_parser.add_argument('--notes', default='')
+    register_parser.add_argument('--promote', action='store_true', help='Activate the new version right away')
+    commands.add_parser('list', help='List registered versions')
+    promote_parser = commands.add_parser('promote', help='Activate a version')
+    promote_parser.add_argument('version')
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.root)
+    if args.command == 'register':
+        new_version = registry.register(args.path, backend=args.backend, notes=args.notes)
+        if args.promote:
+            registry.promote(new_version)
+    elif args.command == 'list':
+        active = registry.active_version()
+        for meta in registry.list_versions():
+            marker = '*' if meta['version'] == active else ' '
+            print(f"{marker} {meta['version']}  {meta['backend']:<9}  {meta['created']}  {meta['notes']}")
+    elif args.command == 'promote':
+        registry.promote(args.version)
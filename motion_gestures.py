@@ -0,0 +1,293 @@
+import pickle
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+WRIST = 0
+
+
+class LandmarkRingBuffer:
+    def __init__(self, window: int = 20, num_landmarks: int = NUM_LANDMARKS):
+        """
+        Fixed-size ring buffer of recent landmark arrays for one hand.
+
+        Windowed features are maintained incrementally: running sums of the
+        positions, squared positions and absolute frame-to-frame velocities are
+        updated by adding the incoming frame and subtracting the one that falls
+        out of the window, so every push and every feature read is O(1) in the
+        window length.
+
+        Args:
+            window: Number of frames kept
+            num_landmarks: Landmarks per hand
+        """
+        self.window = window
+        self.num_landmarks = num_landmarks
+        self.frames = np.zeros((window, num_landmarks, 3), dtype=np.float32)
+        # Wrist x direction reversals, one flag per frame, for wave detection
+        self.reversals = np.zeros(window, dtype=np.int8)
+        self.reset()
+
+    def reset(self):
+        """Forget all history, e.g. when the hand leaves the frame."""
+        self.count = 0
+        self.head = 0  # Index the next frame is written to
+        self.pushes = 0
+        self.sum_pos = np.zeros((self.num_landmarks, 3))
+        self.sum_sq = np.zeros((self.num_landmarks, 3))
+        self.sum_abs_vel = np.zeros((self.num_landmarks, 3))
+        self.reversal_count = 0
+        self._last_direction = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def is_full(self) -> bool:
+        return self.count == self.window
+
+    def _index(self, age: int) -> int:
+        """Ring index of the frame ``age`` steps back from the newest (0 = newest)."""
+        return (self.head - 1 - age) % self.window
+
+    @property
+    def latest(self) -> np.ndarray:
+        return self.frames[self._index(0)]
+
+    @property
+    def oldest(self) -> np.ndarray:
+        return self.frames[self._index(self.count - 1)]
+
+    def push(self, landmarks: Sequence):
+        """
+        Append one frame of landmarks, dropping the oldest frame if full.
+
+        Args:
+            landmarks: 21 landmarks as [x, y, z] values
+        """
+        incoming = np.asarray(landmarks, dtype=np.float32)[:self.num_landmarks, :3]
+
+        if self.count == self.window:
+            # Remove the outgoing frame and the velocity that led away from it
+            outgoing = self.frames[self.head].astype(np.float64)
+            following = self.frames[(self.head + 1) % self.window].astype(np.float64)
+            self.sum_pos -= outgoing
+            self.sum_sq -= outgoing * outgoing
+            self.sum_abs_vel -= np.abs(following - outgoing)
+            self.reversal_count -= self.reversals[(self.head + 1) % self.window]
+            self.count -= 1
+
+        reversal = 0
+        if self.count > 0:
+            velocity = incoming.astype(np.float64) - self.latest
+            self.sum_abs_vel += np.abs(velocity)
+            direction = int(np.sign(velocity[WRIST, 0]))
+            if direction != 0:
+                reversal = int(self._last_direction != 0 and direction != self._last_direction)
+                self._last_direction = direction
+
+        self.frames[self.head] = incoming
+        self.reversals[self.head] = reversal
+        self.reversal_count += reversal
+        self.sum_pos += incoming
+        self.sum_sq += incoming.astype(np.float64) ** 2
+        self.head = (self.head + 1) % self.window
+        self.count += 1
+        self.pushes += 1
+
+        # Running sums slowly accumulate rounding error, so rebuild them now
+        # and then. Amortized over the pushes this is still O(1).
+        if self.pushes % (self.window * 50) == 0:
+            self._recompute()
+
+    def _recompute(self):
+        """Rebuild the running sums from the stored frames."""
+        ordered = np.stack([self.frames[self._index(age)] for age in range(self.count - 1, -1, -1)]).astype(np.float64)
+        self.sum_pos = ordered.sum(axis=0)
+        self.sum_sq = (ordered * ordered).sum(axis=0)
+        self.sum_abs_vel = np.abs(np.diff(ordered, axis=0)).sum(axis=0)
+
+    def velocity(self) -> np.ndarray:
+        """Per-joint velocity between the two newest frames."""
+        if self.count < 2:
+            return np.zeros((self.num_landmarks, 3))
+        return self.latest.astype(np.float64) - self.frames[self._index(1)]
+
+    def displacement(self) -> np.ndarray:
+        """Per-joint net displacement across the window."""
+        if self.count < 2:
+            return np.zeros((self.num_landmarks, 3))
+        return self.latest.astype(np.float64) - self.oldest
+
+    def mean(self) -> np.ndarray:
+        """Per-joint rolling mean position."""
+        return self.sum_pos / max(self.count, 1)
+
+    def std(self) -> np.ndarray:
+        """Per-joint rolling standard deviation."""
+        mean = self.mean()
+        return np.sqrt(np.maximum(self.sum_sq / max(self.count, 1) - mean * mean, 0.0))
+
+    def path_length(self) -> np.ndarray:
+        """Per-joint summed absolute movement across the window."""
+        return self.sum_abs_vel
+
+    def window_features(self) -> np.ndarray:
+        """
+        Flattened window feature vector for the sequence classifier.
+
+        Positions are taken relative to the rolling wrist mean so the features
+        do not depend on where the hand is in the frame.
+
+        Returns:
+            Array of 5 * 21 * 3 values (mean, std, velocity, displacement, path length)
+        """
+        mean = self.mean()
+        return np.concatenate([
+            (mean - mean[WRIST]).ravel(),
+            self.std().ravel(),
+            self.velocity().ravel(),
+            self.displacement().ravel(),
+            self.path_length().ravel()
+        ])
+
+
+class MotionGestureClassifier:
+    def __init__(self, model=None, labels: Optional[Dict[str, str]] = None,
+                 min_confidence: float = 0.6, wave_min_path: float = 0.25, wave_min_reversals: int = 2,
+                 wave_rule: bool = False, window: int = 20):
+        """
+        Sequence classifier stage for signs that are defined by movement.
+
+        With a trained model (any classifier with predict_proba over
+        ``LandmarkRingBuffer.window_features``) that model is used. Without one,
+        and only if ``wave_rule`` is set, a built-in rule recognizes the
+        side-to-side wave of 'goodbye'. The rule is off by default because it
+        has not been validated on real recordings.
+
+        The live ring buffers must hold ``window`` frames, the window the
+        model was trained on; build them with make_buffer().
+
+        Args:
+            model: Optional trained sequence model
+            labels: Mapping from model class to gesture name
+            min_confidence: Minimum class probability for a model prediction
+            wave_min_path: Minimum horizontal wrist travel (normalized units) for a wave
+            wave_min_reversals: Minimum number of direction changes for a wave
+            wave_rule: Use the built-in wave rule when there is no model
+            window: Frames per window the model expects
+        """
+        self.model = model
+        self.labels = labels or {}
+        self.min_confidence = min_confidence
+        self.wave_min_path = wave_min_path
+        self.wave_min_reversals = wave_min_reversals
+        self.wave_rule = wave_rule
+        self.window = window
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> 'MotionGestureClassifier':
+        """
+        Load a sequence model written by train_motion_model().
+
+        Args:
+            path: Path to the pickled model dictionary
+
+        Returns:
+            Classifier using the loaded model and the window it was trained on
+        """
+        with open(path, 'rb') as f:
+            model_dict = pickle.load(f)
+        return cls(model=model_dict['model'], labels=model_dict.get('labels'),
+                   window=model_dict.get('window', 20), **kwargs)
+
+    def make_buffer(self) -> LandmarkRingBuffer:
+        """Ring buffer for one hand, sized to the classifier's window."""
+        return LandmarkRingBuffer(window=self.window)
+
+    def classify(self, buffers: List[LandmarkRingBuffer]) -> Optional[str]:
+        """
+        Classify the motion currently held in the hand buffers.
+
+        Args:
+            buffers: One ring buffer per tracked hand
+
+        Returns:
+            Gesture name or None if no motion gesture is recognized
+        """
+        full = [buffer for buffer in buffers if buffer.is_full]
+        if not full:
+            return None
+        if any(buffer.window != self.window for buffer in full):
+            raise ValueError(f"Motion buffers must hold {self.window} frames, the window the classifier expects")
+
+        if self.model is not None:
+            features = np.stack([buffer.window_features() for buffer in full])
+            probabilities = self.model.predict_proba(features)
+            row, column = np.unravel_index(np.argmax(probabilities), probabilities.shape)
+            if probabilities[row, column] < self.min_confidence:
+                return None
+            label = self.model.classes_[column]
+            return self.labels.get(str(label), str(label))
+
+        if not self.wave_rule:
+            return None
+        for buffer in full:
+            if self._is_wave(buffer):
+                return 'goodbye'
+        return None
+
+    def _is_wave(self, buffer: LandmarkRingBuffer) -> bool:
+        """A wave travels far horizontally, turns around, and ends up roughly where it started."""
+        path = buffer.path_length()[WRIST, 0]
+        net = abs(buffer.displacement()[WRIST, 0])
+        return (path >= self.wave_min_path
+                and buffer.reversal_count >= self.wave_min_reversals
+                and net < 0.5 * path)
+
+
+def sequence_window_features(sequence: Sequence, window: int = 20) -> np.ndarray:
+    """
+    Window features of the last ``window`` frames of a landmark sequence.
+
+    Args:
+        sequence: Frames of 21 [x, y, z] landmarks for one hand
+        window: Window length (must match the live buffer)
+
+    Returns:
+        Window feature vector
+    """
+    buffer = LandmarkRingBuffer(window=window)
+    for landmarks in sequence:
+        buffer.push(landmarks)
+    return buffer.window_features()
+
+
+def train_motion_model(sequences: List, labels: List, output_path: str, window: int = 20,
+                       label_names: Optional[Dict[str, str]] = None) -> Dict:
+    """
+    Train a sequence model on recorded landmark sequences.
+
+    Args:
+        sequences: List of per-hand landmark sequences
+        labels: Class label per sequence
+        output_path: Where to write the pickled model dictionary
+        window: Window length; saved with the model and used to size the live ring buffers
+        label_names: Optional mapping from class label to gesture name
+
+    Returns:
+        Dictionary with training statistics
+    """
+    from sklearn.ensemble import RandomForestClassifier
+
+    features = np.stack([sequence_window_features(sequence, window) for sequence in sequences])
+    model = RandomForestClassifier(n_estimators=100, n_jobs=-1, random_state=42)
+    model.fit(features, np.asarray(labels))
+    model.set_params(n_jobs=1)
+
+    with open(output_path, 'wb') as f:
+        pickle.dump({'model': model, 'labels': label_names or {}, 'window': window}, f)
+
+    print(f"✅ Motion model trained on {len(sequences)} sequences, saved to '{output_path}'")
+    return {'sequences': len(sequences), 'classes': [str(c) for c in model.classes_], 'output_path': output_path}
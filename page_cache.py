@@ -0,0 +1,142 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+from flask import Response, render_template, request
+
+
+class RenderedPageCache:
+    def __init__(self, app, max_entries: int = 64, check_interval: float = 1.0):
+        """
+        Cache of fully rendered template pages.
+
+        Entries are keyed on the template name plus its context variables, so
+        it only suits templates whose output does not depend on the user.
+        Every entry carries an ETag; a request whose If-None-Match matches
+        gets an empty 304. The template folder is checked for modified files
+        at most every ``check_interval`` seconds, and any change clears both
+        this cache and Jinja's compiled templates, so edits show up even when
+        Jinja auto-reload is off.
+
+        Args:
+            app: Flask application whose templates are rendered
+            max_entries: Rendered pages kept (least recently used are evicted)
+            check_interval: Seconds between template modification checks
+        """
+        self.app = app
+        self.max_entries = max_entries
+        self.check_interval = check_interval
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+        self._signature = self._template_signature()
+        self._last_check = time.time()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+
+    def _template_files(self):
+        root = os.path.join(self.app.root_path, self.app.template_folder)
+        for directory, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                yield os.path.relpath(path, root).replace(os.sep, '/'), path
+
+    def _template_signature(self) -> Tuple:
+        return tuple(sorted((name, os.stat(path).st_mtime_ns) for name, path in self._template_files()))
+
+    def _check_templates(self):
+        """Clear the cache if any template file was added, removed or modified."""
+        now = time.time()
+        if now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+        signature = self._template_signature()
+        if signature != self._signature:
+            with self._lock:
+                self._pages.clear()
+                self._signature = signature
+            # Without auto-reload (debug off) Jinja keeps serving its compiled copies
+            if self.app.jinja_env.cache is not None:
+                self.app.jinja_env.cache.clear()
+            self.invalidations += 1
+            print("♻️ Templates changed, rendered page cache cleared")
+
+    def warm(self) -> int:
+        """
+        Compile every template up front so the first visitor does not pay for it.
+
+        Returns:
+            Number of templates compiled
+        """
+        count = 0
+        for name, _ in self._template_files():
+            if name.endswith('.html'):
+                self.app.jinja_env.get_template(name)
+                count += 1
+        return count
+
+    def render(self, template_name: str, **context) -> Response:
+        """
+        Render a template through the cache. Must be called inside a request.
+
+        Args:
+            template_name: Template to render
+            **context: Template context; must be hashable values
+
+        Returns:
+            200 response with the page, or 304 when the client's copy is current
+        """
+        self._check_templates()
+        # url_for() output depends on the mount point, so it is part of the key
+        key = (template_name, request.script_root, tuple(sorted(context.items())))
+        with self._lock:
+            entry = self._pages.get(key)
+            if entry is not None:
+                self._pages.move_to_end(key)
+        if entry is None:
+            self.misses += 1
+            body = render_template(template_name, **context).encode('utf-8')
+            entry = (body, hashlib.sha1(body).hexdigest())
+            with self._lock:
+                self._pages[key] = entry
+                while len(self._pages) > self.max_entries:
+                    self._pages.popitem(last=False)
+        else:
+            self.hits += 1
+
+        body, etag = entry
+        if etag in request.if_none_match:
+            self.not_modified += 1
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype='text/html')
+        response.set_etag(etag)
+        # Pages sit behind the login check, so browsers must revalidate every time
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+
+    def clear(self):
+        """Drop every rendered page."""
+        with self._lock:
+            self._pages.clear()
+
+    def get_stats(self) -> Dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with size, hit rate, 304 count and invalidations
+        """
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._pages),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0,
+            'not_modified': self.not_modified,
+            'invalidations': self.invalidations
+        }
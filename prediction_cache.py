@@ -0,0 +1,187 @@
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+import numpy as np
+
+
+class PredictionCache:
+    def __init__(self, max_size: int = 256, max_age: float = 5.0, tolerance: float = 0.12):
+        """
+        Bounded LRU cache of predictions for feature vectors seen moments ago.
+
+        A sign held steady produces feature vectors that only differ by
+        landmark jitter. A lookup is a hit when a cached vector lies within
+        ``tolerance`` times the spread of the new vector (its largest minus
+        its smallest value, i.e. the hand size) on every feature, so the
+        classifier only runs once per distinct pose. Snapping every value to
+        a fixed grid does not work here: with 42 values, jitter of a few
+        thousandths nearly always pushes one of them across a bin edge.
+
+        Args:
+            max_size: Maximum number of cached predictions
+            max_age: Seconds after which an entry is considered stale
+            tolerance: Largest per-feature difference for a hit, as a fraction of the hand size
+        """
+        self.max_size = max_size
+        self.max_age = max_age
+        self.tolerance = tolerance
+        self._vectors = None  # Allocated on the first put(), once the vector length is known
+        self._stored_at = np.zeros(max_size)
+        self._used = np.zeros(max_size, dtype=np.int64)
+        self._occupied = np.zeros(max_size, dtype=bool)
+        self._predictions = [None] * max_size
+        self._clock = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _nearest(self, features: np.ndarray) -> Optional[int]:
+        """Slot of the closest cached vector within tolerance, or None."""
+        if self._vectors is None or not self._occupied.any():
+            return None
+        distances = np.abs(self._vectors - features).max(axis=1)
+        distances[~self._occupied] = np.inf
+        slot = int(np.argmin(distances))
+        return slot if distances[slot] <= self.tolerance * np.ptp(features) else None
+
+    def get(self, features: np.ndarray, now: Optional[float] = None):
+        """
+        Look up the prediction of a nearby cached vector.
+
+        Args:
+            features: Feature vector
+            now: Current time (defaults to time.monotonic())
+
+        Returns:
+            Tuple of (found, prediction)
+        """
+        features = np.asarray(features, dtype=np.float64).ravel()
+        slot = self._nearest(features)
+        if slot is None:
+            self.misses += 1
+            return False, None
+
+        now = time.monotonic() if now is None else now
+        if now - self._stored_at[slot] > self.max_age:
+            self._occupied[slot] = False
+            self._predictions[slot] = None
+            self.expirations += 1
+            self.misses += 1
+            return False, None
+
+        self._clock += 1
+        self._used[slot] = self._clock
+        self.hits += 1
+        return True, self._predictions[slot]
+
+    def put(self, features: np.ndarray, prediction, now: Optional[float] = None):
+        """
+        Store a prediction, evicting the least recently used entry if full.
+
+        Args:
+            features: Feature vector the prediction belongs to
+            prediction: Value to cache (None is a valid prediction)
+            now: Current time (defaults to time.monotonic())
+        """
+        features = np.asarray(features, dtype=np.float64).ravel()
+        if self._vectors is None or self._vectors.shape[1] != len(features):
+            self._vectors = np.zeros((self.max_size, len(features)))
+            self._occupied[:] = False
+
+        free = np.flatnonzero(~self._occupied)
+        if len(free):
+            slot = int(free[0])
+        else:
+            slot = int(np.argmin(self._used))
+            self.evictions += 1
+
+        self._clock += 1
+        self._vectors[slot] = features
+        self._stored_at[slot] = time.monotonic() if now is None else now
+        self._used[slot] = self._clock
+        self._predictions[slot] = prediction
+        self._occupied[slot] = True
+
+    def lookup(self, features: np.ndarray, compute: Callable[[np.ndarray], object]):
+        """
+        Return the cached prediction for a feature vector, computing it on a miss.
+
+        Args:
+            features: Feature vector
+            compute: Function that produces a fresh prediction
+
+        Returns:
+            Prediction for the feature vector
+        """
+        found, prediction = self.get(features)
+        if not found:
+            prediction = compute(features)
+            self.put(features, prediction)
+        return prediction
+
+    def clear(self):
+        """Drop all cached predictions (statistics are kept)."""
+        self._occupied[:] = False
+        self._predictions = [None] * self.max_size
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get_stats(self) -> Dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with size, hit rate and eviction counters
+        """
+        return {
+            'size': int(self._occupied.sum()),
+            'max_size': self.max_size,
+            'max_age_s': self.max_age,
+            'tolerance': self.tolerance,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hit_rate, 4),
+            'evictions': self.evictions,
+            'expirations': self.expirations
+        }
+
+
+def verify_cache(cache: PredictionCache, predict: Callable[[np.ndarray], object],
+                 feature_vectors: Iterable[np.ndarray]) -> Dict:
+    """
+    Replay feature vectors through a cache and compare against fresh predictions.
+
+    Every vector is looked up through the cache and also classified directly.
+    A mismatch means the tolerance is too loose: two poses that the
+    classifier tells apart were treated as the same.
+
+    Args:
+        cache: Cache under test
+        predict: Function that classifies a single feature vector
+        feature_vectors: Replayed feature vectors, in frame order
+
+    Returns:
+        Dictionary with the number of frames, mismatches and the cache hit rate
+    """
+    frames = 0
+    mismatches = 0
+    hits_before, misses_before = cache.hits, cache.misses
+    for features in feature_vectors:
+        frames += 1
+        cached = cache.lookup(features, predict)
+        if cached != predict(features):
+            mismatches += 1
+
+    lookups = (cache.hits - hits_before) + (cache.misses - misses_before)
+    return {
+        'frames': frames,
+        'mismatches': mismatches,
+        'agreement': 1.0 - mismatches / frames if frames else 1.0,
+        'hit_rate': (cache.hits - hits_before) / lookups if lookups else 0.0
+    }
@@ -11,6 +11,12 @@ import requests
 from dotenv import load_dotenv
 
 from reliable_sign_recognition import ReliableSignRecognizer
+from animation_bundles import AnimationBundleCompiler
+from text_to_sign import SignClipIndex, StitchedClipCache
+from model_registry import ModelRegistry
+from transcript_store import TranscriptStore
+from page_cache import RenderedPageCache
+from micro_batching import MicroBatchClassifier
 
 app = Flask(__name__)
 load_dotenv()
@@ -20,15 +26,41 @@ socketio = SocketIO(app, cors_allowed_origins="*")
 # Global variables
 camera = None
 sign_recognizer = None
+model_registry = None
 is_camera_active = False
 current_gesture = None
 current_translation = None
+animation_compiler = None
+sign_clip_index = None
+stitched_clip_cache = None
+transcript_store = None
+page_cache = None
+batch_service = None
 
 def initialize_system():
     """Initialize the reliable sign language recognition system."""
-    global sign_recognizer
+    global sign_recognizer, model_registry, transcript_store, batch_service
     try:
-        sign_recognizer = ReliableSignRecognizer()
+        # One classification service shared by every stream, so concurrent frames share a predict() call
+        batch_service = MicroBatchClassifier()
+
+        # Prefer the active registry version over the bundled model.p
+        model_registry = ModelRegistry()
+        active_version = model_registry.active_version()
+        if active_version:
+            meta = model_registry.get(active_version)
+            sign_recognizer = ReliableSignRecognizer(model_path=model_registry.model_path(active_version),
+                                                     backend=meta['backend'], batch_service=batch_service)
+            sign_recognizer.model_version = active_version
+        else:
+            sign_recognizer = ReliableSignRecognizer(batch_service=batch_service)
+        
+        # Hot-swap whenever another version is promoted (e.g. from the registry CLI)
+        def on_model_promoted(version, model):
+            if sign_recognizer.model_version != version:
+                sign_recognizer.swap_model(model, version, model_registry.get(version)['backend'])
+        model_registry.watch(on_model_promoted)
+        transcript_store = TranscriptStore()
         print("✅ Reliable system initialized successfully!")
         print("🎯 Using MediaPipe hand detection for accurate recognition!")
         print("🤖 Random Forest model loaded and ready!")
@@ -63,6 +95,45 @@ def get_camera():
             return None
     return camera
 
+def get_animation_compiler():
+    """Get the animation bundle compiler, compiling the sign scripts on first use."""
+    global animation_compiler
+    if animation_compiler is None:
+        animation_compiler = AnimationBundleCompiler()
+    return animation_compiler
+
+def get_sign_clip_index():
+    """Get the text-to-sign vocabulary index, building it on first use."""
+    global sign_clip_index
+    if sign_clip_index is None:
+        sign_clip_index = SignClipIndex(sign_recognizer.sign_mapping if sign_recognizer else None)
+    return sign_clip_index
+
+def get_stitched_clip_cache():
+    """Get the stitched clip cache, starting its worker on first use."""
+    global stitched_clip_cache
+    if stitched_clip_cache is None:
+        stitched_clip_cache = StitchedClipCache()
+    return stitched_clip_cache
+
+def get_page_cache():
+    """Get the rendered page cache for the template routes."""
+    global page_cache
+    if page_cache is None:
+        page_cache = RenderedPageCache(app)
+    return page_cache
+
+def bundle_response(data: bytes, bundle_hash: str, immutable: bool = False):
+    """Build a cacheable response for a packed animation bundle."""
+    if bundle_hash in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = Response(data, mimetype='application/octet-stream')
+    response.set_etag(bundle_hash)
+    response.headers['X-Bundle-Hash'] = bundle_hash
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable' if immutable else 'no-cache'
+    return response
+
 def release_camera():
     """Release camera resources."""
     global camera
@@ -71,12 +142,13 @@ def release_camera():
         camera = None
         print("📹 Camera released")
 
-def process_frame(frame: np.ndarray) -> Tuple[Optional[str], Optional[str]]:
+def process_frame(frame: np.ndarray, user: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
     """
     Process frame for sign language recognition.
     
     Args:
         frame: Input frame
+        user: Logged-in user whose transcript receives new recognitions
         
     Returns:
         Tuple of (gesture, translation)
@@ -93,6 +165,8 @@ def process_frame(frame: np.ndarray) -> Tuple[Optional[str], Optional[str]]:
             current_gesture = gesture
             current_translation = translation
             print(f"🎯 Recognized: {gesture} -> {translation}")
+            if user and transcript_store is not None:
+                transcript_store.record_recognition(user, gesture)
         elif gesture is None and translation is None:
             # No hands detected, clear current gesture
             current_gesture = None
@@ -104,7 +178,7 @@ def process_frame(frame: np.ndarray) -> Tuple[Optional[str], Optional[str]]:
         print(f"Error processing frame: {e}")
         return None, None
 
-def generate_frames():
+def generate_frames(user: Optional[str] = None):
     """Generate video frames for streaming."""
     global is_camera_active
     
@@ -118,6 +192,7 @@ def generate_frames():
     frame_count = 0
     
     while is_camera_active:
+        loop_start = time.time()
         ret, frame = camera.read()
         if not ret:
             print("❌ Error reading camera frame")
@@ -125,7 +200,7 @@ def generate_frames():
         
         try:
             # Process frame for sign recognition
-            gesture, translation = process_frame(frame)
+            gesture, translation = process_frame(frame, user)
             
             # Encode frame for transmission
             _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
@@ -148,8 +223,11 @@ def generate_frames():
         except Exception as e:
             print(f"Error in generate_frames: {e}")
         
-        # Control frame rate
-        time.sleep(0.1)  # 10 FPS
+        # Control frame rate (the recognizer may lower it under load)
+        frame_interval = 0.1  # 10 FPS
+        if sign_recognizer is not None and sign_recognizer.quality is not None:
+            frame_interval = sign_recognizer.quality.frame_interval
+        time.sleep(max(0.0, frame_interval - (time.time() - loop_start)))
     
     print("📹 Video stream stopped")
     release_camera()
@@ -157,7 +235,7 @@ def generate_frames():
 @app.route('/')
 def landing():
     """Public marketing landing page."""
-    return render_template('landing.html', show_chatbot=True)
+    return get_page_cache().render('landing.html', show_chatbot=True)
 
 @app.route('/login', methods=['GET', 'POST'])
 def login():
@@ -209,7 +287,8 @@ def start_camera():
             test_camera = get_camera()
             if test_camera and test_camera.isOpened():
                 is_camera_active = True
-                threading.Thread(target=generate_frames, daemon=True).start()
+                # The frame thread has no request context, so pass the user along
+                threading.Thread(target=generate_frames, args=(session.get('user_email'),), daemon=True).start()
                 print("🎬 Camera started")
                 return jsonify({'status': 'success', 'message': 'Camera started'})
             else:
@@ -234,6 +313,27 @@ def stop_camera():
         print(f"❌ Error stopping camera: {e}")
         return jsonify({'status': 'error', 'message': f'Error stopping camera: {str(e)}'})
 
+@app.route('/recording/start', methods=['POST'])
+def start_recording():
+    """Start recording detected hand landmarks for offline debugging and benchmarks."""
+    if not session.get('user_email'):
+        return jsonify({'error': 'Authentication required'}), 401
+    if sign_recognizer is None:
+        return jsonify({'error': 'Sign recognizer not initialized'}), 500
+    path = os.path.join('recordings', time.strftime('landmarks_%Y%m%d_%H%M%S.slr'))
+    sign_recognizer.start_recording(path)
+    return jsonify({'status': 'success', 'path': path})
+
+@app.route('/recording/stop', methods=['POST'])
+def stop_recording():
+    """Stop recording landmarks."""
+    if not session.get('user_email'):
+        return jsonify({'error': 'Authentication required'}), 401
+    if sign_recognizer is None:
+        return jsonify({'error': 'Sign recognizer not initialized'}), 500
+    path = sign_recognizer.stop_recording()
+    return jsonify({'status': 'success', 'path': path})
+
 @app.route('/get_gesture_info/<gesture>')
 def get_gesture_info(gesture):
     """Get information about a specific gesture."""
@@ -273,6 +373,134 @@ def serve_assets(filename):
     """Serve files from the assets directory."""
     return send_from_directory('static', filename)
 
+@app.route('/animations/bundle')
+def animation_bundle():
+    """Serve packed avatar keyframes: the full library, or only the signs of ?text= or ?signs=."""
+    compiler = get_animation_compiler()
+    text = request.args.get('text', '').strip()
+    signs = request.args.get('signs', '').strip()
+    
+    if not text and not signs:
+        return bundle_response(compiler.full_bundle, compiler.full_hash)
+    
+    sequence = compiler.signs_for_text(text) if text else [name.strip().upper() for name in signs.split(',')]
+    data, bundle_hash = compiler.bundle_for(sequence)
+    return bundle_response(data, bundle_hash)
+
+@app.route('/animations/bundle/<bundle_hash>')
+def animation_bundle_by_hash(bundle_hash):
+    """Serve the full keyframe bundle under its content hash so browsers can cache it forever."""
+    compiler = get_animation_compiler()
+    if bundle_hash != compiler.full_hash:
+        return jsonify({'error': 'Unknown bundle', 'current': compiler.full_hash}), 404
+    return bundle_response(compiler.full_bundle, compiler.full_hash, immutable=True)
+
+@app.route('/text_to_sign', methods=['POST'])
+def text_to_sign():
+    """Turn a sentence into a sign playback plan, optionally with a single stitched clip."""
+    data = request.get_json(silent=True) or {}
+    text = (data.get('text') or '').strip()
+    if not text:
+        return jsonify({'error': 'No text provided'}), 400
+    
+    index = get_sign_clip_index()
+    plan = index.plan(text)
+    
+    # Avatar animations for the plan, fetched in one request
+    animation_signs = []
+    for step in plan:
+        if step['type'] == 'animation':
+            animation_signs.append(step['sign'])
+        elif step['type'] == 'fingerspell':
+            animation_signs.extend(step['signs'])
+    
+    result = {
+        'text': text,
+        'plan': plan,
+        'animation_bundle': url_for('animation_bundle', signs=','.join(animation_signs)) if animation_signs else None
+    }
+    
+    if data.get('stitch'):
+        clip_paths = [index.clip_path(step['sign']) for step in plan if step['type'] == 'video']
+        stitched = get_stitched_clip_cache().request(text, clip_paths)
+        if stitched['status'] == 'ready':
+            stitched['url'] = url_for('stitched_clip', key=stitched['key'])
+        result['stitched'] = stitched
+    
+    return jsonify(result)
+
+@app.route('/text_to_sign/stitched/<key>.mp4')
+def stitched_clip(key):
+    """Serve a pre-stitched sentence clip from the disk cache."""
+    cache = get_stitched_clip_cache()
+    return send_from_directory(cache.cache_dir, f'{key}.mp4')
+
+@app.route('/models')
+def list_models():
+    """List registered model versions with the active version and shadow statistics."""
+    if not session.get('user_email'):
+        return jsonify({'error': 'Authentication required'}), 401
+    if sign_recognizer is None or model_registry is None:
+        return jsonify({'error': 'Sign recognizer not initialized'}), 500
+    return jsonify({
+        'versions': model_registry.list_versions(),
+        'active': model_registry.active_version(),
+        'serving': sign_recognizer.model_version,
+        'shadow': sign_recognizer.shadow.get_stats() if sign_recognizer.shadow is not None else None
+    })
+
+@app.route('/models/<version>/shadow', methods=['POST'])
+def shadow_model(version):
+    """Start scoring live frames with a candidate version without serving its results."""
+    if not session.get('user_email'):
+        return jsonify({'error': 'Authentication required'}), 401
+    if sign_recognizer is None or model_registry is None:
+        return jsonify({'error': 'Sign recognizer not initialized'}), 500
+    try:
+        sign_recognizer.start_shadow(model_registry.load(version), version)
+        return jsonify({'status': 'success', 'message': f'Shadowing model {version}'})
+    except KeyError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 404
+
+@app.route('/models/shadow/stop', methods=['POST'])
+def stop_shadow_model():
+    """Stop the shadow evaluation and return its final statistics."""
+    if not session.get('user_email'):
+        return jsonify({'error': 'Authentication required'}), 401
+    if sign_recognizer is None:
+        return jsonify({'error': 'Sign recognizer not initialized'}), 500
+    return jsonify({'status': 'success', 'shadow': sign_recognizer.stop_shadow()})
+
+@app.route('/models/<version>/promote', methods=['POST'])
+def promote_model(version):
+    """Make a version active and swap it in without restarting."""
+    if not session.get('user_email'):
+        return jsonify({'error': 'Authentication required'}), 401
+    if sign_recognizer is None or model_registry is None:
+        return jsonify({'error': 'Sign recognizer not initialized'}), 500
+    try:
+        model = model_registry.load(version)
+    except KeyError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 404
+    
+    shadow = sign_recognizer.shadow
+    report = shadow.get_stats() if shadow is not None and shadow.version == version else None
+    if report is not None:
+        sign_recognizer.stop_shadow()
+    model_registry.promote(version)
+    sign_recognizer.swap_model(model, version, model_registry.get(version)['backend'])
+    return jsonify({'status': 'success', 'message': f'Model {version} is now active', 'shadow_report': report})
+
+@app.route('/batching/stats')
+def batching_stats():
+    """Batch size and latency histograms of the shared classification service."""
+    if batch_service is None:
+        return jsonify({'error': 'Classification service not initialized'}), 500
+    stats = batch_service.get_stats()
+    if request.args.get('reset') and session.get('user_email'):
+        batch_service.reset_stats()
+    return jsonify(stats)
+
 @app.route('/get_translator_info')
 def get_translator_info():
     """Get information about the translator."""
@@ -287,14 +515,17 @@ def learn():
     """Learning dashboard page."""
     if not session.get('user_email'):
         return redirect(url_for('login'))
-    return render_template('learn.html', show_chatbot=True)
+    return get_page_cache().render('learn.html', show_chatbot=True)
 
 @app.route('/learn-basic-signs')
 def learn_basic_signs():
     """Learn basic signs page."""
     if not session.get('user_email'):
         return redirect(url_for('login'))
-    return render_template('module-learn-basic-signs.html', show_chatbot=True)
+    # Content-hashed URL: the bundle is cached until the sign scripts change
+    bundle_url = url_for('animation_bundle_by_hash', bundle_hash=get_animation_compiler().full_hash)
+    return get_page_cache().render('module-learn-basic-signs.html', show_chatbot=True,
+                                   animation_bundle_url=bundle_url)
 
 @app.route('/learn-words')
 def learn_words():
@@ -308,35 +539,48 @@ def module_greetings():
     """Greetings module page."""
     if not session.get('user_email'):
         return redirect(url_for('login'))
-    return render_template('module-greetings.html', show_chatbot=True)
+    return get_page_cache().render('module-greetings.html', show_chatbot=True)
 
 @app.route('/module-family')
 def module_family():
     """Family module page."""
     if not session.get('user_email'):
         return redirect(url_for('login'))
-    return render_template('module-family.html', show_chatbot=True)
+    return get_page_cache().render('module-family.html', show_chatbot=True)
 
 @app.route('/module-food')
 def module_food():
     """Food module page."""
     if not session.get('user_email'):
         return redirect(url_for('login'))
-    return render_template('module-food.html', show_chatbot=True)
+    return get_page_cache().render('module-food.html', show_chatbot=True)
 
 @app.route('/dashboard')
 def dashboard():
     """User dashboard page."""
     if not session.get('user_email'):
         return redirect(url_for('login'))
-    return render_template('dashboard.html', show_chatbot=True)
+    return get_page_cache().render('dashboard.html', show_chatbot=True)
 
 @app.route('/how-it-works')
 def how_it_works():
     """How it Works page."""
     if not session.get('user_email'):
         return redirect(url_for('login'))
-    return render_template('how-it-works.html', show_chatbot=True)
+    return get_page_cache().render('how-it-works.html', show_chatbot=True)
+
+@app.route('/dashboard/stats')
+def dashboard_stats():
+    """Recognition and practice statistics of the logged-in user."""
+    user = session.get('user_email')
+    if not user:
+        return jsonify({'error': 'Authentication required'}), 401
+    if transcript_store is None:
+        return jsonify({'error': 'Transcript store not initialized'}), 500
+    stats = transcript_store.get_user_stats(user)
+    if request.args.get('events'):
+        stats['recent_events'] = transcript_store.recent_events(user, request.args.get('events', type=int) or 50)
+    return jsonify(stats)
 
 @app.route('/chat', methods=['POST'])
 def chat():
@@ -428,19 +672,21 @@ def process_sign():
             return jsonify({'error': 'Sign recognizer not initialized'}), 500
             
         # Process the frame using the sign recognizer
-        result = sign_recognizer.process_frame(frame)
+        predicted_sign, _ = sign_recognizer.process_frame(frame)
         
-        if result is None:
+        if predicted_sign is None:
             return jsonify({
                 'status': 'no_hands',
                 'message': 'No hands detected'
             })
-            
-        predicted_sign = result
         
         # Check if the predicted sign matches the current sign
         is_correct = predicted_sign.lower() == current_sign.lower()
         
+        user = session.get('user_email')
+        if user and transcript_store is not None:
+            transcript_store.record_practice(user, current_sign, predicted_sign, is_correct)
+        
         return jsonify({
             'status': 'success',
             'is_correct': is_correct,
@@ -479,6 +725,7 @@ def handle_gesture_info_request(data):
 if __name__ == '__main__':
     # Initialize system on startup
     if initialize_system():
+        print(f"🔥 Compiled {get_page_cache().warm()} templates")
         print("🚀 Starting reliable Flask application...")
         print("📊 Translator Info:", sign_recognizer.get_translator_info())
         print("🤟 Supported Gestures:", sign_recognizer.get_supported_gestures())
@@ -7,10 +7,46 @@ import mediapipe as mp
 import joblib
 import os
 import json
+import itertools
+import threading
+
+from adaptive_quality import AdaptiveQualityController
+from two_hand_classifier import single_hand_features, combined_two_hand_features, FEATURE_LAYOUT
+from prediction_cache import PredictionCache, verify_cache
+from motion_gestures import MotionGestureClassifier, WRIST
+from distilled_classifier import DistilledClassifier, DISTILLED_MODEL_PATH
+from model_registry import ShadowEvaluator
+from landmark_recording import LandmarkRecorder
+from micro_batching import MicroBatchClassifier
 
 class ReliableSignRecognizer:
-    def __init__(self):
-        """Initialize the reliable sign language recognizer using MediaPipe."""
+    def __init__(self, model_path: Optional[str] = None, backend: str = 'forest',
+                 adaptive_quality: bool = True, target_latency: float = 0.08,
+                 two_hand_model_path: Optional[str] = None,
+                 cache_tolerance: Optional[float] = 0.12, cache_check: bool = False,
+                 motion_gestures: bool = False, motion_model_path: Optional[str] = None,
+                 batch_service: Optional[MicroBatchClassifier] = None):
+        """
+        Initialize the reliable sign language recognizer using MediaPipe.
+
+        Args:
+            model_path: Model file in the model.p layout (e.g. a variant from train_sign_model.py),
+                or the .npz weights when backend is 'distilled'
+            backend: 'forest' for the Random Forest or 'distilled' for the NumPy network
+                from distilled_classifier.py
+            adaptive_quality: Step detection quality down under load and back up with headroom
+            target_latency: Per-frame processing budget in seconds for the quality controller
+            two_hand_model_path: Optional combined two-hand model (see two_hand_classifier.py)
+            cache_tolerance: Largest per-feature difference, relative to hand size, for a
+                prediction cache hit, or None to disable the cache
+            cache_check: Verify every cache hit against a fresh prediction (debugging aid)
+            motion_gestures: Run the sequence classifier for moving signs alongside the static model.
+                Off by default: without motion_model_path only the rule-based wave detector runs,
+                which has not been validated on real recordings yet.
+            motion_model_path: Optional trained sequence model (see motion_gestures.py)
+            batch_service: Shared MicroBatchClassifier that batches single-hand predictions
+                with those of other streams (see micro_batching.py)
+        """
         # --- New Stability Logic ---
         self.prediction_history = deque(maxlen=15) # Store last 15 raw predictions
         self.last_recognition_time = 0
@@ -25,14 +61,44 @@ class ReliableSignRecognizer:
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_drawing_styles = mp.solutions.drawing_styles
         
-        # Initialize MediaPipe Hands with optimal settings
-        self.hands = self.mp_hands.Hands(
-            model_complexity=1,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.7,
-            max_num_hands=2,
-            static_image_mode=False
-        )
+        # --- Landmark Recording (opt-in, see start_recording()) ---
+        self.recorder = None
+
+        # --- Model Registry ---
+        # Set by swap_model() / start_shadow(); see model_registry.py
+        self.model_version = None
+        self.shadow = None
+
+        # --- Cross-stream Batching ---
+        self.batch_service = batch_service
+
+        # --- Prediction Cache ---
+        # A sign held steady yields near-identical feature vectors frame after frame
+        self.prediction_cache = PredictionCache(tolerance=cache_tolerance) if cache_tolerance else None
+        self.cache_check = cache_check
+        self.cache_check_mismatches = 0
+
+        # --- Motion Gestures ---
+        # One landmark ring buffer per tracked hand; hands keep their slot from frame to frame
+        self.motion_max_jump = 0.15  # Wrist travel per frame (normalized) beyond which a slot's hand is considered new
+        self.motion_classifier = None
+        self.motion_buffers = []
+        if motion_gestures:
+            if motion_model_path:
+                self.motion_classifier = MotionGestureClassifier.from_file(motion_model_path)
+            else:
+                self.motion_classifier = MotionGestureClassifier(wave_rule=True)
+            # Sized to the window the sequence model was trained on
+            self.motion_buffers = [self.motion_classifier.make_buffer() for _ in range(2)]
+
+        # --- Adaptive Quality ---
+        self.quality = AdaptiveQualityController(target_latency=target_latency) if adaptive_quality else None
+        
+        # Initialize MediaPipe Hands with optimal settings. The stream thread and
+        # /process_sign share it, so process() and swapping it out take the lock.
+        self._hands_lock = threading.Lock()
+        self._hands_config = (1, 2)
+        self.hands = self._create_hands(*self._hands_config)
         
         print("✅ Reliable Hand Detector initialized with MediaPipe!")
 
@@ -42,14 +108,26 @@ class ReliableSignRecognizer:
         # Using standardized lowercase_with_underscores format
         self.labels = { "0": "hello", "1": "help", "2": "thank_you", "3": "goodbye", "4": "happy", "5": "stop", "6": "sorry", "7": "angry", "8": "food", "9": "good", "10": "please", "11": "you", "12": "no", "13": "one", "14": "two" }
         
+        if backend not in ('forest', 'distilled'):
+            raise ValueError(f"Unknown classifier backend '{backend}'")
+        self.backend = backend
+        
         # Use absolute path for model loading
-        model_path = 'd:/Sign_language_translator_v1.0/New Sign Model/Project_Exibition SLT Model-RandomForest/model.p'
+        if model_path is None:
+            if backend == 'distilled':
+                model_path = DISTILLED_MODEL_PATH
+            else:
+                model_path = 'd:/Sign_language_translator_v1.0/New Sign Model/Project_Exibition SLT Model-RandomForest/model.p'
 
         try:
             if os.path.exists(model_path):
-                model_dict = joblib.load(model_path)
-                self.model = model_dict['model']  # Extract model from dictionary
-                print(f"✅ Random Forest model loaded successfully from '{model_path}'")
+                if backend == 'distilled':
+                    self.model = DistilledClassifier.load(model_path)
+                    print(f"✅ Distilled classifier loaded successfully from '{model_path}'")
+                else:
+                    model_dict = joblib.load(model_path)
+                    self.model = model_dict['model']  # Extract model from dictionary
+                    print(f"✅ Random Forest model loaded successfully from '{model_path}'")
                 print(f"✅ Labels are hardcoded. Model supports {len(self.labels)} signs.")
             else:
                 print(f"❌ Error: Model file not found. Looked for '{model_path}'.")
@@ -58,6 +136,20 @@ class ReliableSignRecognizer:
             print(f"❌ Critical Error loading Random Forest model: {e}")
             raise  # Re-raise the exception to ensure the application knows about the failure
         
+        # Optional combined two-hand model for signs that need both hands
+        self.two_hand_model = None
+        if two_hand_model_path:
+            try:
+                two_hand_dict = joblib.load(two_hand_model_path)
+                # Its predict_proba competes with the single-hand model, so only accept
+                # models trained on real two-hand samples in the inference layout
+                if two_hand_dict.get('feature_layout') != FEATURE_LAYOUT or not two_hand_dict.get('two_hand_samples'):
+                    raise ValueError("model was not trained on two-hand samples in the combined_two_hand_features layout")
+                self.two_hand_model = two_hand_dict['model']
+                print(f"✅ Two-hand model loaded from '{two_hand_model_path}'")
+            except Exception as e:
+                print(f"⚠️ Could not load two-hand model, continuing without it: {e}")
+        
         # Comprehensive sign language mapping
         self.sign_mapping = {
             # Basic signs
@@ -147,6 +239,38 @@ class ReliableSignRecognizer:
         print("🎯 Reliable Sign Recognizer initialized!")
         print(f"📚 Supports {len(self.sign_mapping)} different signs!")
     
+    def _create_hands(self, model_complexity: int, max_num_hands: int):
+        """
+        Build a MediaPipe Hands instance.
+        
+        Args:
+            model_complexity: MediaPipe landmark model complexity (0 or 1)
+            max_num_hands: Maximum number of hands to detect
+            
+        Returns:
+            MediaPipe Hands instance
+        """
+        return self.mp_hands.Hands(
+            model_complexity=model_complexity,
+            min_detection_confidence=0.7,
+            min_tracking_confidence=0.7,
+            max_num_hands=max_num_hands,
+            static_image_mode=False
+        )
+    
+    def _apply_quality_level(self):
+        """Rebuild MediaPipe Hands if the active quality level needs different settings."""
+        level = self.quality.level
+        config = (level.model_complexity, level.max_num_hands)
+        if config != self._hands_config:
+            # Build the replacement first so detection only waits for the swap itself
+            hands = self._create_hands(*config)
+            with self._hands_lock:
+                old, self.hands, self._hands_config = self.hands, hands, config
+                old.close()
+        print(f"⚙️ Quality level {self.quality.level_index}: {level.fps} FPS, "
+              f"{level.width}x{level.height}, complexity={level.model_complexity}, hands={level.max_num_hands}")
+    
     def detect_hands_mediapipe(self, frame: np.ndarray) -> Tuple[np.ndarray, List]:
         """
         Detect hands using MediaPipe and extract landmarks.
@@ -157,11 +281,20 @@ class ReliableSignRecognizer:
         Returns:
             Tuple of (processed_frame, landmarks_list)
         """
+        # Downscale for detection when the quality controller asks for it.
+        # Landmarks are normalized, so they still map onto the full-size frame.
+        detection_frame = frame
+        if self.quality is not None:
+            level = self.quality.level
+            if frame.shape[1] > level.width or frame.shape[0] > level.height:
+                detection_frame = cv2.resize(frame, (level.width, level.height), interpolation=cv2.INTER_AREA)
+        
         # Convert BGR to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        rgb_frame = cv2.cvtColor(detection_frame, cv2.COLOR_BGR2RGB)
         
         # Process the frame
-        results = self.hands.process(rgb_frame)
+        with self._hands_lock:
+            results = self.hands.process(rgb_frame)
         
         processed_frame = frame.copy()
         landmarks_list = []
@@ -181,6 +314,10 @@ class ReliableSignRecognizer:
                 landmarks = self._extract_mediapipe_landmarks(hand_landmarks, frame.shape)
                 landmarks_list.append(landmarks)
         
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.append(time.time(), landmarks_list)
+        
         return processed_frame, landmarks_list
     
     def _extract_mediapipe_landmarks(self, hand_landmarks, frame_shape) -> List:
@@ -217,23 +354,111 @@ class ReliableSignRecognizer:
         Returns:
             Tuple of (gesture, translation)
         """
+        start_time = time.perf_counter()
+        
         # Detect hands using MediaPipe
         processed_frame, landmarks_list = self.detect_hands_mediapipe(frame)
-
+        
+        result = self.process_landmarks(landmarks_list)
+        
+        # Feed the measured latency into the quality control loop
+        if self.quality is not None and self.quality.record(time.perf_counter() - start_time):
+            self._apply_quality_level()
+        
+        return result
+    
+    def process_landmarks(self, landmarks_list: List, timestamp: Optional[float] = None) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Run recognition and the stability logic on already detected landmarks.
+        
+        Args:
+            landmarks_list: List of hand landmarks for one frame
+            timestamp: Frame time for the cooldown (defaults to now; replay passes recorded times)
+            
+        Returns:
+            Tuple of (gesture, translation)
+        """
         # Use reliable landmark-based recognition to get a raw prediction
         raw_gesture = self._reliable_recognition(landmarks_list)
+        
+        # A recognized movement takes precedence over the static pose of the same frame
+        motion_gesture = self._update_motion(landmarks_list)
+        if motion_gesture:
+            raw_gesture = motion_gesture
 
         # Add the raw prediction (or None) to our history
         self.prediction_history.append(raw_gesture)
 
         # Check if the predictions have become stable
-        stable_gesture = self._check_gesture_stability()
+        stable_gesture = self._check_gesture_stability(now=timestamp)
+        
         if stable_gesture:
             translation = self.translate_gesture(stable_gesture)
             return stable_gesture, translation
         else:
             return None, None
     
+    def _update_motion(self, landmarks_list: List) -> Optional[str]:
+        """
+        Push the current landmarks into the motion buffers and run the sequence classifier.
+        
+        Args:
+            landmarks_list: List of hand landmarks for this frame
+            
+        Returns:
+            Recognized motion gesture or None
+        """
+        if self.motion_classifier is None:
+            return None
+        
+        hands = sorted((landmarks for landmarks in landmarks_list if len(landmarks) >= 21), key=lambda landmarks: landmarks[0][0])
+        hands = hands[:len(self.motion_buffers)]
+        assigned = self._assign_motion_slots(hands)
+        for slot, buffer in enumerate(self.motion_buffers):
+            hand = assigned.get(slot)
+            if hand is None:
+                if len(buffer):
+                    # The hand left the frame (or was missed), so the movement is broken
+                    buffer.reset()
+                continue
+            if len(buffer) and np.linalg.norm(np.asarray(hand[WRIST][:2]) - buffer.latest[WRIST, :2]) > self.motion_max_jump:
+                # A different hand took over this slot; never splice two hands into one history
+                buffer.reset()
+            buffer.push(hand)
+        
+        try:
+            return self.motion_classifier.classify(self.motion_buffers)
+        except Exception as e:
+            print(f"❌ Error during motion classification: {e}")
+            return None
+    
+    def _assign_motion_slots(self, hands: List) -> Dict[int, List]:
+        """
+        Match this frame's hands to motion slots by nearest wrist to the previous frame.
+        
+        Sorting by wrist x alone would swap slots whenever one of two hands is
+        missed for a frame, and the swap would look like wrist travel.
+        
+        Args:
+            hands: Hands of this frame (at most one per slot)
+            
+        Returns:
+            Mapping of slot index to hand landmarks
+        """
+        previous = [buffer.latest[WRIST, :2].copy() if len(buffer) else None for buffer in self.motion_buffers]
+        best, best_cost = {}, None
+        for slots in itertools.permutations(range(len(self.motion_buffers)), len(hands)):
+            cost = 0.0
+            for hand, slot in zip(hands, slots):
+                if previous[slot] is None:
+                    # Starting a fresh slot costs as much as the largest allowed jump
+                    cost += self.motion_max_jump
+                else:
+                    cost += float(np.linalg.norm(np.asarray(hand[WRIST][:2]) - previous[slot]))
+            if best_cost is None or cost < best_cost:
+                best, best_cost = dict(zip(slots, hands)), cost
+        return best
+    
     def _reliable_recognition(self, landmarks_list: List) -> Optional[str]:
         """
         Reliable recognition using MediaPipe landmarks.
@@ -247,13 +472,70 @@ class ReliableSignRecognizer:
         if not landmarks_list:
             return None
         
-        for landmarks in landmarks_list:
-            if len(landmarks) >= 21:  # MediaPipe provides 21 landmarks
-                gesture = self._analyze_landmarks_for_signs(landmarks)
-                if gesture:
-                    return gesture
+        hands = [landmarks for landmarks in landmarks_list if len(landmarks) >= 21]  # MediaPipe provides 21 landmarks
+        if not hands:
+            return None
         
-        return None
+        # Several hands: classify them together and keep the most confident one
+        if len(hands) > 1 or self.two_hand_model is not None:
+            return self._analyze_hands_batched(hands)
+        
+        return self._analyze_landmarks_for_signs(hands[0])
+    
+    def _analyze_hands_batched(self, hands: List) -> Optional[str]:
+        """
+        Classify all detected hands with a single batched predict_proba call.
+        
+        Every hand's feature vector is stacked into one array and the winner is
+        the hand with the highest class probability. If a combined two-hand
+        model is loaded, its prediction competes on confidence as well.
+        
+        Args:
+            hands: List of hand landmarks (21 points each)
+            
+        Returns:
+            Recognized sign or None
+        """
+        model = self.model  # Read once, the model may be hot-swapped meanwhile
+        if not model:
+            print("❌ Error: Model not loaded")
+            return None
+        
+        try:
+            best_label, best_confidence = None, -1.0
+            
+            feature_matrix = np.stack([single_hand_features(landmarks) for landmarks in hands])
+            start = time.perf_counter()
+            probabilities = model.predict_proba(feature_matrix)
+            model_latency = time.perf_counter() - start
+            row, column = np.unravel_index(np.argmax(probabilities), probabilities.shape)
+            best_label, best_confidence = model.classes_[column], probabilities[row, column]
+            
+            # The candidate is a single-hand model too, so compare it hand by hand
+            # against what the active model said about each vector
+            shadow = self.shadow
+            if shadow is not None:
+                for feature_vector, hand_probabilities in zip(feature_matrix, probabilities):
+                    primary = self.labels.get(str(model.classes_[int(np.argmax(hand_probabilities))]))
+                    shadow.submit(feature_vector, primary, model_latency / len(feature_matrix))
+            
+            if self.two_hand_model is not None:
+                combined = combined_two_hand_features(hands).reshape(1, -1)
+                combined_probabilities = self.two_hand_model.predict_proba(combined)[0]
+                column = int(np.argmax(combined_probabilities))
+                if combined_probabilities[column] > best_confidence:
+                    best_label = self.two_hand_model.classes_[column]
+                    best_confidence = combined_probabilities[column]
+            
+            gesture_name = self.labels.get(str(best_label))
+            if gesture_name:
+                print(f"[RAW PREDICTION]: '{gesture_name}' ({best_confidence:.2f}, {len(hands)} hands)")
+            
+            return gesture_name
+            
+        except Exception as e:
+            print(f"❌ Error during batched model prediction: {e}")
+            return None
     
     def _analyze_landmarks_for_signs(self, landmarks: List) -> Optional[str]:
         """
@@ -266,33 +548,37 @@ class ReliableSignRecognizer:
         Returns:
             Recognized sign or None
         """
-        if not self.model:
+        # Snapshot the cache before the model: swap_model() replaces them in the
+        # opposite order, so a new cache is never filled by the old model.
+        cache = self.prediction_cache
+        model = self.model
+        if not model:
             print("❌ Error: Model not loaded")
             return None
         
         try:
-            # 1. Extract x and y coordinates only (matching the training data)
-            data_aux = []
-            x_ = []
-            y_ = []
-            
-            # First collect all x and y coordinates
-            for landmark in landmarks:
-                x_.append(landmark[0])  # x coordinate
-                y_.append(landmark[1])  # y coordinate
+            # Extract x and y coordinates normalized to min x and y (matching the training data)
+            feature_vector = single_hand_features(landmarks)
             
-            # Then normalize them relative to min x and y
-            for landmark in landmarks:
-                data_aux.append(landmark[0] - min(x_))  # normalized x
-                data_aux.append(landmark[1] - min(y_))  # normalized y
+            model_latency = []
+            def predict(features):
+                start = time.perf_counter()
+                gesture = self._predict_gesture(features, model)
+                model_latency.append(time.perf_counter() - start)
+                return gesture
             
-            # The model expects a 2D array for prediction: (1, num_features)
-            feature_vector_2d = np.array([data_aux])
+            if cache is None:
+                gesture_name = predict(feature_vector)
+            else:
+                gesture_name = cache.lookup(feature_vector, predict)
+                if self.cache_check and gesture_name != self._predict_gesture(feature_vector, model):
+                    self.cache_check_mismatches += 1
+                    print(f"⚠️ Cache mismatch: cached '{gesture_name}' differs from a fresh prediction")
             
-            # Make prediction using predict()
-            prediction = self.model.predict(feature_vector_2d)
-            prediction_index = str(prediction[0])  # Convert prediction to string for label lookup
-            gesture_name = self.labels.get(prediction_index)
+            # Let a candidate model score the same vector off the critical path
+            shadow = self.shadow
+            if shadow is not None:
+                shadow.submit(feature_vector, gesture_name, model_latency[0] if model_latency else None)
 
             # --- Enhanced Debugging ---
             if gesture_name:
@@ -304,15 +590,141 @@ class ReliableSignRecognizer:
             print(f"❌ Error during model prediction: {e}")
             return None
     
+    def _predict_gesture(self, feature_vector: np.ndarray, model=None) -> Optional[str]:
+        """
+        Run the model on a single feature vector.
+        
+        Args:
+            feature_vector: 42-value hand feature vector
+            model: Classifier to use (defaults to the active model)
+            
+        Returns:
+            Gesture name or None
+        """
+        model = model if model is not None else self.model
+        if self.batch_service is not None:
+            # Classified together with the vectors of other streams; the model travels
+            # with the request so a hot-swap never mixes models within one frame
+            prediction_index = str(self.batch_service.predict(feature_vector, model))
+        else:
+            # The model expects a 2D array for prediction: (1, num_features)
+            prediction = model.predict(feature_vector.reshape(1, -1))
+            prediction_index = str(prediction[0])  # Convert prediction to string for label lookup
+        return self.labels.get(prediction_index)
+    
+    def verify_prediction_cache(self, feature_vectors) -> Dict:
+        """
+        Check that cached predictions match fresh ones on replayed data.
+        
+        Uses a fresh cache with the same settings so live statistics are untouched.
+        
+        Args:
+            feature_vectors: Iterable of 42-value feature vectors in frame order
+            
+        Returns:
+            Dictionary with frames, mismatches, agreement and hit rate
+        """
+        tolerance = self.prediction_cache.tolerance if self.prediction_cache else 0.12
+        cache = PredictionCache(tolerance=tolerance, max_age=float('inf'))
+        return verify_cache(cache, self._predict_gesture, (np.asarray(f, dtype=np.float64) for f in feature_vectors))
+    
+    def start_recording(self, path: str, chunk_frames: int = 256):
+        """
+        Start recording detected landmarks to a file (see landmark_recording.py).
+        
+        Args:
+            path: Recording data file
+            chunk_frames: Frames buffered per written chunk
+        """
+        self.stop_recording()
+        self.recorder = LandmarkRecorder(path, chunk_frames=chunk_frames)
+        print(f"⏺️ Recording landmarks to '{path}'")
+    
+    def stop_recording(self) -> Optional[str]:
+        """
+        Stop recording and write any buffered frames.
+        
+        Returns:
+            Path of the finished recording, or None if nothing was recording
+        """
+        recorder = self.recorder
+        if recorder is None:
+            return None
+        self.recorder = None
+        recorder.close()
+        print(f"⏹️ Recording saved to '{recorder.path}'")
+        return recorder.path
+    
+    def swap_model(self, model, version: Optional[str] = None, backend: Optional[str] = None):
+        """
+        Atomically replace the active classifier while frames keep flowing.
+        
+        The new model must already be loaded. The swap itself is two reference
+        assignments, so the frame loop never waits on a lock: frames in flight
+        finish with the model they started with, and the next frame uses the
+        new one. The prediction cache is replaced too, because its entries
+        belong to the old model.
+        
+        Args:
+            model: Loaded classifier with predict / predict_proba / classes_
+            version: Registry version name, for reporting
+            backend: 'forest' or 'distilled', for reporting
+        """
+        new_cache = None
+        if self.prediction_cache is not None:
+            old = self.prediction_cache
+            new_cache = PredictionCache(max_size=old.max_size, max_age=old.max_age, tolerance=old.tolerance)
+        
+        # Model first, then cache (see _analyze_landmarks_for_signs)
+        self.model = model
+        self.prediction_cache = new_cache
+        if self.batch_service is not None:
+            self.batch_service.set_model(model)
+        self.model_version = version
+        if backend:
+            self.backend = backend
+        print(f"🔄 Active model swapped to {version or 'an unversioned model'}")
+    
+    def start_shadow(self, model, version: str):
+        """
+        Start scoring live feature vectors with a candidate model in the background.
+        
+        Args:
+            model: Loaded candidate classifier
+            version: Candidate version name
+        """
+        previous = self.shadow
+        self.shadow = ShadowEvaluator(model, version, self.labels)
+        if previous is not None:
+            previous.stop()
+        print(f"👥 Shadow evaluation started for model {version}")
+    
+    def stop_shadow(self) -> Optional[Dict]:
+        """
+        Stop the shadow evaluation.
+        
+        Returns:
+            Final shadow statistics, or None if no shadow was running
+        """
+        shadow = self.shadow
+        if shadow is None:
+            return None
+        self.shadow = None
+        shadow.stop()
+        return shadow.get_stats()
+    
     def _classify_by_finger_patterns(self, *args, **kwargs):
         # This function is now obsolete and can be removed or left as a placeholder.
         return None
     
-    def _check_gesture_stability(self) -> Optional[str]:
+    def _check_gesture_stability(self, now: Optional[float] = None) -> Optional[str]:
         """
         Check if a gesture is stable by looking at the prediction history.
         A gesture is stable if it's the most common prediction in the last
         N frames and exceeds a confidence threshold.
+        
+        Args:
+            now: Current time for the cooldown timer (defaults to time.time())
         """
         # Wait until the history buffer is full to make a decision
         if len(self.prediction_history) < self.prediction_history.maxlen:
@@ -329,7 +741,7 @@ class ReliableSignRecognizer:
         # Check if the most common gesture meets our stability threshold
         if self.prediction_history.count(most_common_gesture) >= self.prediction_history.maxlen * self.stability_threshold:
             # The gesture is stable. Now, check the cooldown timer.
-            current_time = time.time()
+            current_time = time.time() if now is None else now
             if current_time - self.last_recognition_time > self.min_time_between_recognitions:
                 self.last_recognition_time = current_time
                 # Clear history to prevent immediate re-triggering
@@ -360,7 +772,7 @@ class ReliableSignRecognizer:
         Returns:
             Dictionary with gesture information
         """
-        return { 'name': gesture, 'description': f'Sign language gesture: {gesture}', 'translation': self.translate_gesture(gesture), 'confidence': self.min_model_confidence, 'model': 'Random Forest Classifier' }
+        return { 'name': gesture, 'description': f'Sign language gesture: {gesture}', 'translation': self.translate_gesture(gesture), 'confidence': self.min_model_confidence, 'model': 'Distilled Neural Network' if self.backend == 'distilled' else 'Random Forest Classifier' }
     
     def get_supported_gestures(self) -> List[str]:
         """
@@ -383,22 +795,31 @@ class ReliableSignRecognizer:
             'version': '0.8.1',
             'status': 'active',
             'supported_languages': ['en'], # Assuming English for now
-            'model_type': 'Random Forest Classifier' if self.model else 'Rule-Based',
-            'available_modules': ['hand_detection', 'landmarks'],
+            'model_type': ('Distilled Neural Network' if self.backend == 'distilled' else 'Random Forest Classifier') if self.model else 'Rule-Based',
+            'available_modules': ['hand_detection', 'landmarks'] + (['motion'] if self.motion_classifier is not None else []),
             'ml_models': {
-                'hand_landmarks': 'Random Forest' if self.model else 'Not Loaded',
+                'hand_landmarks': ('Distilled Network' if self.backend == 'distilled' else 'Random Forest') if self.model else 'Not Loaded',
                 'status': 'loaded' if self.model else 'not_loaded',
-                'supported_signs': len(self.labels) if self.model else len(self.sign_mapping)
+                'supported_signs': len(self.labels) if self.model else len(self.sign_mapping),
+                'two_hand_model': 'loaded' if self.two_hand_model is not None else 'not_loaded',
+                'version': self.model_version,
+                'shadow': self.shadow.get_stats() if self.shadow is not None else None
             },
             'accuracy_improvements': {
                 'mediapipe_detection': 'Enabled',
                 'finger_pattern_analysis': 'Enabled',
                 'gesture_stability': 'Enabled',
                 'comprehensive_signs': f'{len(self.sign_mapping)} signs'
-            }
+            },
+            'quality': self.quality.get_state() if self.quality is not None else None,
+            'prediction_cache': dict(self.prediction_cache.get_stats(), check_mismatches=self.cache_check_mismatches)
+                                if self.prediction_cache is not None else None,
+            'batching': self.batch_service.get_stats() if self.batch_service is not None else None
         }
     
     def release(self):
         """Release resources."""
+        self.stop_recording()
         if hasattr(self, 'hands'):
-            self.hands.close()
\ No newline at end of file
+            with self._hands_lock:
+                self.hands.close()
\ No newline at end of file
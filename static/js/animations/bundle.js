@@ -0,0 +1,111 @@
+// Packed keyframe bundle loader (see animation_bundles.py for the format)
+const AXES = ['x', 'y', 'z'];
+const PROPERTIES = ['rotation', 'position'];
+
+export const decodeBundle = (buffer) => {
+
+    const view = new DataView(buffer);
+    const decoder = new TextDecoder();
+    let offset = 0;
+
+    const readString = () => {
+        const length = view.getUint8(offset);
+        const text = decoder.decode(new Uint8Array(buffer, offset + 1, length));
+        offset += 1 + length;
+        return text;
+    };
+
+    const magic = decoder.decode(new Uint8Array(buffer, 0, 4));
+    if (magic !== 'SLKB') {
+        throw new Error('Not a sign keyframe bundle');
+    }
+    const boneCount = view.getUint16(6, true);
+    const signCount = view.getUint16(8, true);
+    const sequenceLength = view.getUint16(10, true);
+    offset = 12;
+
+    const bones = [];
+    for (let i = 0; i < boneCount; i++) {
+        bones.push(readString());
+    }
+
+    const signs = {};
+    const names = [];
+    for (let i = 0; i < signCount; i++) {
+        const name = readString();
+        const keyframeCount = view.getUint16(offset, true);
+        offset += 2;
+
+        const keyframes = [];
+        for (let k = 0; k < keyframeCount; k++) {
+            const trackCount = view.getUint16(offset, true);
+            offset += 2;
+
+            const tracks = [];
+            for (let t = 0; t < trackCount; t++) {
+                const bone = bones[view.getUint16(offset, true)];
+                const flags = view.getUint8(offset + 2);
+                const target = view.getFloat32(offset + 3, true);
+                offset += 7;
+                tracks.push([bone, PROPERTIES[(flags >> 2) & 1], AXES[flags & 3], target, (flags & 8) ? "-" : "+"]);
+            }
+            keyframes.push(tracks);
+        }
+        signs[name] = keyframes;
+        names.push(name);
+    }
+
+    const sequence = [];
+    for (let i = 0; i < sequenceLength; i++) {
+        sequence.push(names[view.getUint16(offset, true)]);
+        offset += 2;
+    }
+
+    return { signs, sequence };
+}
+
+// Turn decoded keyframes into the same ref-based functions the sign scripts define
+export const signPlayer = (keyframes) => (ref) => {
+
+    keyframes.forEach(tracks => {
+        ref.animations.push(tracks.map(track => track.slice()));
+    });
+
+    if(ref.pending === false){
+      ref.pending = true;
+      ref.animate();
+    }
+
+}
+
+const fetchBundle = async (url) => {
+
+    const response = await fetch(url);
+    if (!response.ok) {
+        throw new Error(`Failed to load animation bundle: ${response.status}`);
+    }
+    const bundle = decodeBundle(await response.arrayBuffer());
+
+    // Register every sign globally, exactly like the individual scripts do
+    Object.entries(bundle.signs).forEach(([name, keyframes]) => {
+        window[name] = signPlayer(keyframes);
+    });
+    return bundle;
+}
+
+// Every loader on a page shares one download per bundle URL
+const pending = new Map();
+
+export const loadBundle = (url = '/animations/bundle') => {
+
+    if (!pending.has(url)) {
+        pending.set(url, fetchBundle(url).catch(error => {
+            pending.delete(url);
+            throw error;
+        }));
+    }
+    return pending.get(url);
+}
+
+// Make it available globally
+window.loadAnimationBundle = loadBundle;
@@ -1,26 +1,19 @@
-// Load all word animations
-const wordFiles = ['TIME.js', 'HOME.js', 'PERSON.js', 'YOU.js'];
-
-// Load each word file
-wordFiles.forEach(file => {
-    const script = document.createElement('script');
-    script.type = 'module';
-    script.src = `./Words/${file}`;
-    document.head.appendChild(script);
-});
+import { loadBundle } from './bundle.js';
 
 // Word list
 const wordList = ['TIME', 'HOME', 'PERSON', 'YOU'];
 
-// Wait for all scripts to load and then create the words object
-window.addEventListener('load', () => {
-    setTimeout(() => {
-        window.words = {
-            TIME: window.TIME,
-            HOME: window.HOME,
-            PERSON: window.PERSON,
-            YOU: window.YOU,
-            wordList: wordList
-        };
-    }, 100);
-});
\ No newline at end of file
+// Word animations, filled in from the packed keyframe bundle
+const words = { wordList: wordList };
+
+// Uses the page's bundle URL, so this shares the page's download.
+// Resolves once every word is registered
+const wordsReady = loadBundle(window.ANIMATION_BUNDLE_URL).then(() => {
+    wordList.forEach(word => {
+        words[word] = window[word];
+    });
+    window.words = words;
+    return words;
+});
+
+export { words, wordList, wordsReady };
@@ -0,0 +1,345 @@
+import glob
+import hashlib
+import os
+import queue
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from typing import Dict, List, Optional
+
+import cv2
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+GIFS_DIR = os.path.join(BASE_DIR, 'Gifs')
+ANIMATIONS_DIR = os.path.join(BASE_DIR, 'static', 'js', 'animations')
+STITCHED_CACHE_DIR = os.path.join(BASE_DIR, 'cache', 'stitched')
+
+# Multi-word signs whose clip is named without separators (Gifs/Thankyou.mp4)
+KNOWN_PHRASES = ['thank_you']
+
+
+def normalize_sentence(text: str) -> List[str]:
+    """
+    Lowercase a sentence and split it into words, dropping punctuation.
+
+    Args:
+        text: Input sentence
+
+    Returns:
+        List of words
+    """
+    return re.findall(r"[a-z0-9]+", text.lower().replace("'", ''))
+
+
+class SignClipIndex:
+    def __init__(self, sign_mapping: Optional[Dict[str, str]] = None,
+                 gifs_dir: str = GIFS_DIR, animations_dir: str = ANIMATIONS_DIR):
+        """
+        Precomputed vocabulary of everything the app can sign.
+
+        Clips are looked up by their words joined with '_', so the
+        'thank_you' sign and the phrase "thank you" share a key. Separators
+        are only collapsed for known phrases (KNOWN_PHRASES and the
+        multi-word signs of sign_mapping) whose clip is named without them,
+        like Gifs/Thankyou.mp4; "go od" never matches Good.mp4.
+
+        Args:
+            sign_mapping: Recognizer sign mapping, used for more multi-word phrases and captions
+            gifs_dir: Directory of recorded sign clips
+            animations_dir: Directory containing the Words/ and Alphabets/ avatar scripts
+        """
+        self.gifs_dir = gifs_dir
+        self.videos = {}
+        for path in sorted(glob.glob(os.path.join(gifs_dir, '*.mp4'))):
+            name = os.path.splitext(os.path.basename(path))[0]
+            self.videos[self._key(name)] = name
+
+        self.word_animations = {}
+        for path in sorted(glob.glob(os.path.join(animations_dir, 'Words', '*.js'))):
+            name = os.path.splitext(os.path.basename(path))[0]
+            self.word_animations[self._key(name)] = name
+
+        self.letters = set()
+        for path in glob.glob(os.path.join(animations_dir, 'Alphabets', '*.js')):
+            self.letters.add(os.path.splitext(os.path.basename(path))[0].upper())
+
+        self.captions = dict(sign_mapping or {})
+
+        # Known phrases whose clip or animation is stored under the collapsed name
+        phrases = set(KNOWN_PHRASES) | {key for key in self.captions if '_' in key}
+        self.aliases = {}
+        for phrase in phrases:
+            collapsed = phrase.replace('_', '')
+            if collapsed in self.videos or collapsed in self.word_animations:
+                self.aliases[phrase] = collapsed
+                self.captions.setdefault(collapsed, self.captions.get(phrase, phrase.replace('_', ' ').capitalize()))
+
+        # Longest phrase we need to try when matching greedily
+        keys = phrases | set(self.videos) | set(self.word_animations)
+        self.max_phrase_words = max(len(key.split('_')) for key in keys | {''})
+
+    @staticmethod
+    def _key(name: str) -> str:
+        """Vocabulary key of a clip name: lowercase words joined with '_'."""
+        return '_'.join(normalize_sentence(name.replace('_', ' ')))
+
+    def _match(self, words: List[str]) -> Optional[Dict]:
+        """Plan entry for a phrase if the vocabulary has a clip or animation for it."""
+        key = '_'.join(words)
+        caption = self.captions.get(key, ' '.join(words).capitalize())
+        key = self.aliases.get(key, key)
+        if key in self.videos:
+            name = self.videos[key]
+            return {'type': 'video', 'sign': name, 'src': f'/Gifs/{name}.mp4', 'caption': caption}
+        if key in self.word_animations:
+            return {'type': 'animation', 'sign': self.word_animations[key], 'caption': caption}
+        return None
+
+    def plan(self, text: str) -> List[Dict]:
+        """
+        Tokenize a sentence against the vocabulary and build a playback plan.
+
+        Phrases are matched greedily, longest first. Words with no clip or
+        animation are fingerspelled with the alphabet animations.
+
+        Args:
+            text: Sentence to sign
+
+        Returns:
+            List of playback steps in order
+        """
+        words = normalize_sentence(text)
+        steps = []
+        i = 0
+        while i < len(words):
+            for length in range(min(self.max_phrase_words, len(words) - i), 0, -1):
+                step = self._match(words[i:i + length])
+                if step:
+                    step['token'] = ' '.join(words[i:i + length])
+                    steps.append(step)
+                    i += length
+                    break
+            else:
+                letters = [letter for letter in words[i].upper() if letter in self.letters]
+                if letters:
+                    steps.append({'type': 'fingerspell', 'token': words[i], 'signs': letters, 'caption': words[i]})
+                i += 1
+        return steps
+
+    def clip_path(self, sign: str) -> str:
+        """Absolute path of a recorded clip."""
+        return os.path.join(self.gifs_dir, f'{sign}.mp4')
+
+
+class StitchedClipCache:
+    def __init__(self, cache_dir: str = STITCHED_CACHE_DIR, max_entries: int = 64):
+        """
+        Disk LRU cache of pre-stitched MP4s, filled by a background worker.
+
+        Entries are keyed by the normalized sentence. A file's modification
+        time doubles as its last-used time, so the cache survives restarts.
+
+        Output must be H.264 for browsers to play it in <video>. The clips
+        are joined with ffmpeg when it is installed (stream copy when all
+        clips share size and frame rate, otherwise a libx264 re-encode),
+        else with OpenCV's 'avc1' writer if this OpenCV build can encode
+        H.264. With neither, stitching is disabled and requests report
+        'unavailable' so the client plays the clips one by one.
+
+        Args:
+            cache_dir: Directory for the stitched files
+            max_entries: Number of stitched files kept on disk
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._failed = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.ffmpeg = shutil.which('ffmpeg')
+        self.encoder = 'ffmpeg' if self.ffmpeg else ('opencv' if self._opencv_can_encode_h264() else None)
+        if self.encoder is None:
+            print("⚠️ Neither ffmpeg nor an H.264-capable OpenCV was found; stitched clips are disabled")
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def _opencv_can_encode_h264(self) -> bool:
+        """Check once whether this OpenCV build can write H.264 ('avc1') MP4s."""
+        fd, probe_path = tempfile.mkstemp(dir=self.cache_dir, prefix='.probe-', suffix='.mp4')
+        os.close(fd)
+        try:
+            writer = cv2.VideoWriter(probe_path, cv2.VideoWriter_fourcc(*'avc1'), 10, (64, 64))
+            opened = writer.isOpened()
+            writer.release()
+            return opened
+        finally:
+            os.remove(probe_path)
+
+    @staticmethod
+    def key_for(text: str) -> str:
+        """Cache key of a sentence."""
+        return hashlib.sha1(' '.join(normalize_sentence(text)).encode('utf-8')).hexdigest()[:20]
+
+    def path_for(self, key: str) -> str:
+        """Path of the stitched file for a key."""
+        return os.path.join(self.cache_dir, f'{key}.mp4')
+
+    def request(self, text: str, clip_paths: List[str]) -> Dict:
+        """
+        Get the stitched clip for a sentence, queueing it if it is not ready yet.
+
+        Args:
+            text: Sentence the clips belong to
+            clip_paths: Clips to concatenate, in order
+
+        Returns:
+            Dictionary with 'status' (ready, pending, failed, empty or unavailable) and 'key'
+        """
+        key = self.key_for(text)
+        if not clip_paths:
+            return {'status': 'empty', 'key': key}
+        if self.encoder is None:
+            return {'status': 'unavailable', 'key': key}
+
+        path = self.path_for(key)
+        if os.path.exists(path):
+            os.utime(path)  # Mark as recently used
+            self.hits += 1
+            return {'status': 'ready', 'key': key}
+
+        with self._lock:
+            self.misses += 1
+            if key in self._failed:
+                return {'status': 'failed', 'key': key}
+            if key not in self._pending:
+                self._pending.add(key)
+                self._queue.put((key, list(clip_paths)))
+        return {'status': 'pending', 'key': key}
+
+    def _run(self):
+        """Worker loop that stitches queued requests one at a time."""
+        while True:
+            key, clip_paths = self._queue.get()
+            try:
+                self._stitch(clip_paths, self.path_for(key))
+                self._evict()
+                print(f"🎬 Stitched {len(clip_paths)} clips into '{key}.mp4'")
+            except Exception as e:
+                print(f"❌ Error stitching clips for '{key}': {e}")
+                with self._lock:
+                    self._failed.add(key)
+            finally:
+                with self._lock:
+                    self._pending.discard(key)
+
+    def _stitch(self, clip_paths: List[str], output_path: str):
+        """Concatenate clips into one H.264 MP4 at the first clip's size and frame rate."""
+        temp_path = output_path + '.tmp.mp4'
+        try:
+            if self.encoder == 'ffmpeg':
+                self._stitch_ffmpeg(clip_paths, temp_path)
+            else:
+                self._stitch_opencv(clip_paths, temp_path)
+            os.replace(temp_path, output_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    @staticmethod
+    def _clip_format(clip_path: str):
+        """(fourcc, width, height, fps) of a clip."""
+        capture = cv2.VideoCapture(clip_path)
+        if not capture.isOpened():
+            raise IOError(f"Could not open clip '{clip_path}'")
+        fourcc = int(capture.get(cv2.CAP_PROP_FOURCC)).to_bytes(4, 'little').decode('latin1').lower()
+        clip_format = (fourcc, int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)), int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                       round(capture.get(cv2.CAP_PROP_FPS) or 10, 3))
+        capture.release()
+        return clip_format
+
+    def _stitch_ffmpeg(self, clip_paths: List[str], temp_path: str):
+        formats = [self._clip_format(clip_path) for clip_path in clip_paths]
+        fd, list_path = tempfile.mkstemp(dir=self.cache_dir, prefix='.concat-', suffix='.txt')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                for clip_path in clip_paths:
+                    escaped = os.path.abspath(clip_path).replace("'", "'\\''")
+                    f.write(f"file '{escaped}'\n")
+
+            command = [self.ffmpeg, '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0', '-i', list_path]
+            if len(set(formats)) == 1 and formats[0][0] in ('h264', 'avc1'):
+                # Same encoding everywhere: join the streams without decoding them
+                command += ['-c', 'copy']
+            else:
+                _, width, height, fps = formats[0]
+                command += ['-vf', f'scale={width}:{height},fps={fps}', '-c:v', 'libx264',
+                            '-pix_fmt', 'yuv420p', '-an']
+            command += ['-movflags', '+faststart', '-f', 'mp4', temp_path]
+            result = subprocess.run(command, capture_output=True, text=True)
+            if result.returncode != 0:
+                raise RuntimeError(f"ffmpeg failed: {result.stderr.strip()}")
+        finally:
+            os.remove(list_path)
+
+    def _stitch_opencv(self, clip_paths: List[str], temp_path: str):
+        writer = None
+        size = None
+        try:
+            for clip_path in clip_paths:
+                capture = cv2.VideoCapture(clip_path)
+                if not capture.isOpened():
+                    raise IOError(f"Could not open clip '{clip_path}'")
+                if writer is None:
+                    fps = capture.get(cv2.CAP_PROP_FPS) or 10
+                    size = (int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)), int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+                    writer = cv2.VideoWriter(temp_path, cv2.VideoWriter_fourcc(*'avc1'), fps, size)
+                    if not writer.isOpened():
+                        raise IOError("OpenCV could not open an H.264 writer")
+                while True:
+                    ret, frame = capture.read()
+                    if not ret:
+                        break
+                    if (frame.shape[1], frame.shape[0]) != size:
+                        frame = cv2.resize(frame, size)
+                    writer.write(frame)
+                capture.release()
+        finally:
+            if writer is not None:
+                writer.release()
+
+    def _evict(self):
+        """Delete the least recently used files beyond max_entries."""
+        files = glob.glob(os.path.join(self.cache_dir, '*.mp4'))
+        files = [path for path in files if not path.endswith('.tmp.mp4')]
+        if len(files) <= self.max_entries:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def get_stats(self) -> Dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with entry counts and hit/miss counters
+        """
+        entries = [path for path in glob.glob(os.path.join(self.cache_dir, '*.mp4')) if not path.endswith('.tmp.mp4')]
+        return {
+            'entries': len(entries),
+            'max_entries': self.max_entries,
+            'pending': len(self._pending),
+            'encoder': self.encoder,
+            'hits': self.hits,
+            'misses': self.misses
+        }
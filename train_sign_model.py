@@ -0,0 +1,239 @@
+import argparse
+import copy
+import csv
+import os
+import pickle
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from feature_store import FeatureStore
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_DIR = os.path.join(BASE_DIR, 'New Sign Model', 'Project_Exibition SLT Model-RandomForest')
+DATA_PATH = os.path.join(MODEL_DIR, 'data.pickle')
+VARIANTS_DIR = os.path.join(BASE_DIR, 'models', 'variants')
+
+# Forests trained from scratch: (name, n_estimators, max_depth)
+TRAINED_VARIANTS = [
+    ('full', 100, None),
+    ('depth12', 100, 12),
+    ('depth8', 100, 8),
+]
+# Compacted variants derived from a trained forest by keeping its first trees
+TRUNCATED_VARIANTS = [('full', 50), ('full', 25), ('full', 10), ('depth8', 25)]
+
+
+def load_dataset(path: str = DATA_PATH) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Load training data from data.pickle or a feature store directory.
+
+    Args:
+        path: Pickle with 'data' and 'labels' lists, or a feature_store.py directory
+
+    Returns:
+        Tuple of (features, labels)
+    """
+    if os.path.isdir(path):
+        features, labels = FeatureStore(path).load_all()
+        return features.astype(np.float64), labels
+    with open(path, 'rb') as f:
+        data_dict = pickle.load(f)
+    return np.asarray(data_dict['data'], dtype=np.float64), np.asarray(data_dict['labels'])
+
+
+def duplicate_groups(features: np.ndarray) -> np.ndarray:
+    """
+    Group id per row, shared by rows with identical feature vectors.
+
+    data.pickle holds many exact copies of the same sample. Splitting by these
+    groups keeps every copy on one side of a train/test split, so held-out
+    scores measure generalization rather than memorization.
+
+    Args:
+        features: Feature matrix
+
+    Returns:
+        Integer group id per row
+    """
+    _, groups = np.unique(features, axis=0, return_inverse=True)
+    return groups.ravel()
+
+
+def truncate_forest(forest, n_trees: int):
+    """
+    Copy a fitted forest keeping only its first ``n_trees`` trees.
+
+    Args:
+        forest: Fitted RandomForestClassifier
+        n_trees: Number of trees to keep
+
+    Returns:
+        Compacted forest
+    """
+    compact = copy.deepcopy(forest)
+    compact.estimators_ = compact.estimators_[:n_trees]
+    compact.n_estimators = len(compact.estimators_)
+    return compact
+
+
+def drop_duplicate_rows(features: np.ndarray, labels: np.ndarray) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Keep only the first copy of every identical feature vector.
+
+    Repeated rows add no information to a forest, they only make its
+    bootstrap samples and therefore its trees larger.
+
+    Args:
+        features: Feature matrix
+        labels: Label per row
+
+    Returns:
+        Tuple of (features, labels, number of rows dropped)
+    """
+    _, first = np.unique(duplicate_groups(features), return_index=True)
+    keep = np.sort(first)
+    return features[keep], labels[keep], len(features) - len(keep)
+
+
+def build_variants(features: np.ndarray, labels: np.ndarray, random_state: Optional[int] = 42) -> Dict:
+    """
+    Train every forest variant on the given data, in parallel across all cores.
+
+    Duplicate rows are dropped first (see drop_duplicate_rows).
+
+    Args:
+        features: Training features
+        labels: Training labels
+
+    Returns:
+        Mapping of variant name to forest
+    """
+    from sklearn.ensemble import RandomForestClassifier
+
+    features, labels, _ = drop_duplicate_rows(features, labels)
+    trained = {}
+    for name, n_estimators, max_depth in TRAINED_VARIANTS:
+        forest = RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth,
+                                        n_jobs=-1, random_state=random_state)
+        trained[name] = forest.fit(features, labels)
+
+    variants = {}
+    for name, forest in trained.items():
+        variants[name] = forest
+    for source, n_trees in TRUNCATED_VARIANTS:
+        variants[f'{source}-{n_trees}trees'] = truncate_forest(trained[source], n_trees)
+
+    for forest in variants.values():
+        # Single-sample inference is faster without the thread pool
+        forest.set_params(n_jobs=1)
+    return variants
+
+
+def measure_latency(model, sample: np.ndarray, repeats: int = 200) -> float:
+    """
+    Median single-sample predict() latency in milliseconds.
+
+    Args:
+        model: Fitted classifier
+        sample: One feature vector
+        repeats: Number of timed calls
+
+    Returns:
+        Median latency in milliseconds
+    """
+    sample = sample.reshape(1, -1)
+    model.predict(sample)  # Warm up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict(sample)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+
+def train_and_compact(data_path: str = DATA_PATH, output_dir: str = VARIANTS_DIR, folds: int = 5,
+                      report_path: Optional[str] = None, random_state: Optional[int] = 42) -> List[Dict]:
+    """
+    Cross-validate every variant, then train them on all data and save them.
+
+    Folds are grouped by identical feature vectors (see duplicate_groups), so
+    duplicated samples cannot leak from the training side into the test side.
+
+    Every saved file uses the model.p layout ({'model': forest}), so it can
+    be passed to ReliableSignRecognizer(model_path=...).
+
+    Args:
+        data_path: data.pickle-style training data
+        output_dir: Directory for the model_<variant>.p files
+        folds: Number of stratified cross-validation folds
+        report_path: Optional CSV file for the report table
+        random_state: Seed for reproducible training
+
+    Returns:
+        Report rows, one per variant
+    """
+    from sklearn.model_selection import StratifiedGroupKFold
+
+    features, labels = load_dataset(data_path)
+    groups = duplicate_groups(features)
+    print(f"📚 Loaded {len(features)} samples ({groups.max() + 1} unique) with {features.shape[1]} features "
+          f"and {len(set(labels))} classes")
+    print(f"🧹 {len(features) - groups.max() - 1} duplicate rows are dropped before training")
+
+    fold_scores = {}
+    splitter = StratifiedGroupKFold(n_splits=folds, shuffle=True, random_state=random_state)
+    for fold, (train_index, test_index) in enumerate(splitter.split(features, labels, groups), start=1):
+        for name, forest in build_variants(features[train_index], labels[train_index], random_state).items():
+            fold_scores.setdefault(name, []).append(forest.score(features[test_index], labels[test_index]))
+        print(f"🔁 Fold {fold}/{folds} done")
+
+    os.makedirs(output_dir, exist_ok=True)
+    rows = []
+    for name, forest in build_variants(features, labels, random_state).items():
+        model_bytes = pickle.dumps({'model': forest})
+        output_path = os.path.join(output_dir, f'model_{name}.p')
+        with open(output_path, 'wb') as f:
+            f.write(model_bytes)
+
+        scores = fold_scores[name]
+        rows.append({
+            'variant': name,
+            'trees': len(forest.estimators_),
+            'max_depth': max(estimator.tree_.max_depth for estimator in forest.estimators_),
+            'nodes': sum(estimator.tree_.node_count for estimator in forest.estimators_),
+            'cv_accuracy': round(float(np.mean(scores)), 4),
+            'cv_std': round(float(np.std(scores)), 4),
+            'predict_ms': round(measure_latency(forest, features[0]), 3),
+            'size_kb': round(len(model_bytes) / 1024, 1),
+            'path': output_path
+        })
+
+    print_report(rows)
+    if report_path:
+        with open(report_path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"💾 Report written to '{report_path}'")
+    return rows
+
+
+def print_report(rows: List[Dict]):
+    """Print the accuracy / latency / size table."""
+    columns = ['variant', 'trees', 'max_depth', 'nodes', 'cv_accuracy', 'cv_std', 'predict_ms', 'size_kb']
+    widths = [max(len(column), *(len(str(row[column])) for row in rows)) for column in columns]
+    print('  '.join(column.ljust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print('  '.join(str(row[column]).ljust(width) for column, width in zip(columns, widths)))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Train and compact the sign Random Forest.')
+    parser.add_argument('--data', default=DATA_PATH, help='data.pickle-style training data or a feature store directory')
+    parser.add_argument('--output-dir', default=VARIANTS_DIR, help='Directory for the model variants')
+    parser.add_argument('--folds', type=int, default=5, help='Cross-validation folds')
+    parser.add_argument('--report', help='Optional CSV report path')
+    args = parser.parse_args()
+    train_and_compact(args.data, args.output_dir, folds=args.folds, report_path=args.report)
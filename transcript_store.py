@@ -0,0 +1,271 @@
+import argparse
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Dict, List
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TRANSCRIPT_DB_PATH = os.path.join(BASE_DIR, 'data', 'transcripts.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    user TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    gesture TEXT,
+    expected TEXT,
+    correct INTEGER,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_user_created ON events (user, created);
+CREATE TABLE IF NOT EXISTS user_stats (
+    user TEXT PRIMARY KEY,
+    recognitions INTEGER NOT NULL DEFAULT 0,
+    practice_attempts INTEGER NOT NULL DEFAULT 0,
+    practice_correct INTEGER NOT NULL DEFAULT 0,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS gesture_stats (
+    user TEXT NOT NULL,
+    gesture TEXT NOT NULL,
+    recognitions INTEGER NOT NULL DEFAULT 0,
+    practice_attempts INTEGER NOT NULL DEFAULT 0,
+    practice_correct INTEGER NOT NULL DEFAULT 0,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (user, gesture)
+);
+"""
+
+UPSERT_USER = """
+INSERT INTO user_stats (user, recognitions, practice_attempts, practice_correct, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (user) DO UPDATE SET
+    recognitions = recognitions + excluded.recognitions,
+    practice_attempts = practice_attempts + excluded.practice_attempts,
+    practice_correct = practice_correct + excluded.practice_correct,
+    last_seen = MAX(last_seen, excluded.last_seen)
+"""
+
+UPSERT_GESTURE = """
+INSERT INTO gesture_stats (user, gesture, recognitions, practice_attempts, practice_correct, last_seen)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (user, gesture) DO UPDATE SET
+    recognitions = recognitions + excluded.recognitions,
+    practice_attempts = practice_attempts + excluded.practice_attempts,
+    practice_correct = practice_correct + excluded.practice_correct,
+    last_seen = MAX(last_seen, excluded.last_seen)
+"""
+
+
+class TranscriptStore:
+    def __init__(self, db_path: str = TRANSCRIPT_DB_PATH, batch_size: int = 256,
+                 flush_interval: float = 1.0, max_queue: int = 10000):
+        """
+        Per-user history of recognitions and practice attempts.
+
+        Recording only puts the event on an in-memory queue. A background
+        thread writes queued events in batches to SQLite (WAL mode) and
+        updates the per-user and per-gesture aggregates in the same
+        transaction, so dashboard queries never scan the raw events.
+
+        Args:
+            db_path: SQLite database file
+            batch_size: Maximum events written per transaction
+            flush_interval: Seconds a partial batch may wait before it is written
+            max_queue: Events that may wait for the writer before new ones are dropped
+        """
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self.recorded = 0
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        with closing(self._connect()) as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.executescript(SCHEMA)
+
+        self._stopped = threading.Event()
+        self._writer = threading.Thread(target=self._run, daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path, timeout=10)
+        connection.execute('PRAGMA synchronous=NORMAL')
+        return connection
+
+    def _enqueue(self, event: tuple):
+        self.recorded += 1
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def record_recognition(self, user: str, gesture: str):
+        """
+        Record a gesture recognized on a user's camera stream. Never blocks.
+
+        Args:
+            user: User identifier (the session email)
+            gesture: Recognized gesture
+        """
+        self._enqueue((user, 'recognition', gesture, None, None, time.time()))
+
+    def record_practice(self, user: str, expected: str, predicted: str, correct: bool):
+        """
+        Record the outcome of a practice attempt. Never blocks.
+
+        Args:
+            user: User identifier (the session email)
+            expected: Sign the user was asked to perform
+            predicted: Sign that was recognized
+            correct: Whether the attempt counted as correct
+        """
+        self._enqueue((user, 'practice', predicted, expected, int(correct), time.time()))
+
+    def _run(self):
+        """Writer loop: collect a batch, then write it in one transaction."""
+        connection = self._connect()
+        while not self._stopped.is_set() or not self._queue.empty():
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            deadline = time.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.time())))
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(connection, batch)
+            except Exception as e:
+                print(f"❌ Error writing {len(batch)} transcript events: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        connection.close()
+
+    def _write_batch(self, connection: sqlite3.Connection, batch: List[tuple]):
+        # Fold the batch into aggregate deltas first, so each user/gesture row is upserted once
+        user_deltas = {}
+        gesture_deltas = {}
+        for user, kind, gesture, expected, correct, created in batch:
+            is_recognition = kind == 'recognition'
+            row = user_deltas.setdefault(user, [0, 0, 0, created, created])
+            row[0] += is_recognition
+            row[1] += not is_recognition
+            row[2] += bool(correct)
+            row[3] = min(row[3], created)
+            row[4] = max(row[4], created)
+
+            # Practice attempts count towards the sign that was asked for
+            key = (user, gesture if is_recognition else expected)
+            if key[1] is None:
+                continue
+            row = gesture_deltas.setdefault(key, [0, 0, 0, created])
+            row[0] += is_recognition
+            row[1] += not is_recognition
+            row[2] += bool(correct)
+            row[3] = max(row[3], created)
+
+        with connection:
+            connection.executemany(
+                'INSERT INTO events (user, kind, gesture, expected, correct, created) VALUES (?, ?, ?, ?, ?, ?)', batch)
+            connection.executemany(UPSERT_USER, [(user, *row) for user, row in user_deltas.items()])
+            connection.executemany(UPSERT_GESTURE, [(*key, *row) for key, row in gesture_deltas.items()])
+        self.written += len(batch)
+        self.batches += 1
+
+    def flush(self):
+        """Block until every queued event has been written."""
+        self._queue.join()
+
+    def close(self):
+        """Write the remaining events and stop the writer thread."""
+        self._stopped.set()
+        self._writer.join()
+
+    def get_user_stats(self, user: str) -> Dict:
+        """
+        Dashboard statistics of one user, read from the aggregate tables only.
+
+        Events still waiting in the queue are not included yet.
+
+        Args:
+            user: User identifier
+
+        Returns:
+            Dictionary with totals and per-gesture counts
+        """
+        with closing(self._connect()) as connection:
+            connection.row_factory = sqlite3.Row
+            totals = connection.execute('SELECT * FROM user_stats WHERE user = ?', (user,)).fetchone()
+            gestures = connection.execute(
+                'SELECT * FROM gesture_stats WHERE user = ? ORDER BY recognitions + practice_attempts DESC',
+                (user,)).fetchall()
+
+        if totals is None:
+            return {'user': user, 'recognitions': 0, 'practice_attempts': 0, 'practice_correct': 0,
+                    'practice_accuracy': None, 'first_seen': None, 'last_seen': None, 'gestures': []}
+        stats = dict(totals)
+        stats['practice_accuracy'] = (round(stats['practice_correct'] / stats['practice_attempts'], 4)
+                                      if stats['practice_attempts'] else None)
+        stats['gestures'] = [{key: row[key] for key in row.keys() if key != 'user'} for row in gestures]
+        return stats
+
+    def recent_events(self, user: str, limit: int = 50) -> List[Dict]:
+        """
+        Latest raw events of one user, newest first.
+
+        Args:
+            user: User identifier
+            limit: Maximum number of events
+
+        Returns:
+            List of event dictionaries
+        """
+        with closing(self._connect()) as connection:
+            connection.row_factory = sqlite3.Row
+            rows = connection.execute(
+                'SELECT kind, gesture, expected, correct, created FROM events '
+                'WHERE user = ? ORDER BY created DESC LIMIT ?', (user, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_stats(self) -> Dict:
+        """
+        Get writer statistics.
+
+        Returns:
+            Dictionary with queue depth and write counters
+        """
+        return {
+            'recorded': self.recorded,
+            'written': self.written,
+            'dropped': self.dropped,
+            'queued': self._queue.qsize(),
+            'batches': self.batches,
+            'avg_batch_size': round(self.written / self.batches, 1) if self.batches else None
+        }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Inspect the recognition transcript store.')
+    parser.add_argument('user', help='User identifier (session email)')
+    parser.add_argument('--db', default=TRANSCRIPT_DB_PATH, help='SQLite database file')
+    parser.add_argument('--events', type=int, default=0, help='Also print this many recent events')
+    args = parser.parse_args()
+
+    store = TranscriptStore(args.db)
+    print(json.dumps(store.get_user_stats(args.user), indent=2))
+    if args.events:
+        print(json.dumps(store.recent_events(args.user, args.events), indent=2))
+    store.close()
@@ -0,0 +1,169 @@
+import argparse
+import pickle
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Per-hand features are the 21 (x, y) landmark pairs used by data.pickle.
+SINGLE_HAND_FEATURES = 42
+TWO_HAND_FEATURES = 2 * SINGLE_HAND_FEATURES
+# Written into trained model files; the recognizer only loads models with this layout
+FEATURE_LAYOUT = 'two_hand_wrist_x_shared_origin'
+
+
+def single_hand_features(landmarks: Sequence) -> np.ndarray:
+    """
+    Build the 42-value feature vector the Random Forest was trained on.
+
+    Args:
+        landmarks: 21 MediaPipe landmarks as [x, y, z] lists
+
+    Returns:
+        Array of x/y coordinates normalized to the hand's min x and min y
+    """
+    points = np.asarray(landmarks, dtype=np.float64)[:, :2]
+    return (points - points.min(axis=0)).ravel()
+
+
+def combined_two_hand_features(landmarks_list: List) -> np.ndarray:
+    """
+    Build the 84-value feature vector for the combined two-hand model.
+
+    Hands are ordered left to right by wrist x so the layout does not depend
+    on MediaPipe's detection order. Both hands are normalized against the
+    shared min x and min y, which keeps their relative placement. When only
+    one hand is visible the second half is zero-padded.
+
+    Args:
+        landmarks_list: List of per-hand landmark lists
+
+    Returns:
+        Combined feature vector
+    """
+    hands = [np.asarray(landmarks, dtype=np.float64)[:, :2] for landmarks in landmarks_list[:2]]
+    hands.sort(key=lambda points: points[0, 0])
+    origin = np.min([points.min(axis=0) for points in hands], axis=0)
+
+    features = np.zeros(TWO_HAND_FEATURES)
+    for slot, points in enumerate(hands):
+        start = slot * SINGLE_HAND_FEATURES
+        features[start:start + SINGLE_HAND_FEATURES] = (points - origin).ravel()
+    return features
+
+
+def pad_to_two_hands(data: List) -> np.ndarray:
+    """
+    Convert data.pickle-style samples into the combined two-hand layout.
+
+    Samples that already carry 84 values are kept as they are, single-hand
+    samples with 42 values get a zero-padded second hand. A 42-value sample
+    is normalized to its own hand's minimum, which is exactly what
+    combined_two_hand_features produces for a single visible hand.
+
+    Args:
+        data: List of feature vectors
+
+    Returns:
+        Array of shape (n_samples, 84)
+    """
+    padded = np.zeros((len(data), TWO_HAND_FEATURES))
+    for i, sample in enumerate(data):
+        sample = np.asarray(sample, dtype=np.float64)[:TWO_HAND_FEATURES]
+        padded[i, :len(sample)] = sample
+    return padded
+
+
+def validate_two_hand_layout(features: np.ndarray) -> np.ndarray:
+    """
+    Find 84-value samples whose layout differs from combined_two_hand_features.
+
+    Two-hand training samples must be built with combined_two_hand_features:
+    hands ordered left to right by wrist x, and both normalized against the
+    shared min x and min y (so the smallest x and the smallest y over both
+    hands are 0).
+
+    Args:
+        features: Array of shape (n_samples, 84) with both hands present
+
+    Returns:
+        Boolean mask of samples that do not match the inference layout
+    """
+    first = features[:, :SINGLE_HAND_FEATURES].reshape(-1, 21, 2)
+    second = features[:, SINGLE_HAND_FEATURES:].reshape(-1, 21, 2)
+    both = np.concatenate([first, second], axis=1)
+    shared_origin = np.all(np.isclose(both.min(axis=1), 0.0, atol=1e-6), axis=1)
+    wrist_order = first[:, 0, 0] <= second[:, 0, 0]
+    return ~(shared_origin & wrist_order)
+
+
+def train_two_hand_model(data_path: str, output_path: str, n_estimators: int = 100,
+                         random_state: Optional[int] = 42) -> Dict:
+    """
+    Train the combined two-hand model variant from data.pickle-style data.
+
+    The data must contain real two-hand samples (84 values built with
+    combined_two_hand_features). A model trained on zero-padded single-hand
+    samples only has never seen a second hand, yet its confidence would
+    compete with the single-hand model at inference, so training is refused.
+
+    Args:
+        data_path: Path to a pickle with 'data' and 'labels' lists
+        output_path: Where to write the model (same {'model': ...} layout as model.p)
+        n_estimators: Number of trees in the forest
+        random_state: Seed for reproducible training
+
+    Returns:
+        Dictionary with training statistics
+    """
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.model_selection import train_test_split
+
+    with open(data_path, 'rb') as f:
+        data_dict = pickle.load(f)
+
+    two_hand_rows = np.asarray([len(sample) >= TWO_HAND_FEATURES for sample in data_dict['data']])
+    if not two_hand_rows.any():
+        raise ValueError(f"'{data_path}' has no two-hand samples ({TWO_HAND_FEATURES} values); "
+                         "a two-hand model trained on padded single-hand data would only add noise")
+    
+    features = pad_to_two_hands(data_dict['data'])
+    labels = np.asarray(data_dict['labels'])
+    
+    mismatched = validate_two_hand_layout(features[two_hand_rows])
+    if mismatched.any():
+        raise ValueError(f"{int(mismatched.sum())} of {int(two_hand_rows.sum())} two-hand samples do not use the "
+                         "combined_two_hand_features layout (wrist-x order, shared min origin)")
+    if two_hand_rows.mean() < 0.1:
+        print(f"⚠️ Only {int(two_hand_rows.sum())} of {len(features)} samples show two hands; "
+              "the two-hand model will be weak")
+
+    x_train, x_test, y_train, y_test = train_test_split(
+        features, labels, test_size=0.2, shuffle=True, stratify=labels, random_state=random_state
+    )
+    model = RandomForestClassifier(n_estimators=n_estimators, n_jobs=-1, random_state=random_state)
+    model.fit(x_train, y_train)
+    accuracy = float(model.score(x_test, y_test))
+
+    # Single-sample inference is faster without the thread pool.
+    model.set_params(n_jobs=1)
+    with open(output_path, 'wb') as f:
+        pickle.dump({'model': model, 'feature_mode': 'two_hand', 'feature_layout': FEATURE_LAYOUT,
+                     'two_hand_samples': int(two_hand_rows.sum())}, f)
+
+    print(f"✅ Two-hand model trained on {len(features)} samples, accuracy {accuracy:.2%}")
+    print(f"💾 Saved to '{output_path}'")
+    return {'samples': len(features), 'two_hand_samples': int(two_hand_rows.sum()), 'accuracy': accuracy,
+            'output_path': output_path}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Train the combined two-hand sign classifier.')
+    parser.add_argument('data_path', help='data.pickle-style training data')
+    parser.add_argument('output_path', help='Output model file')
+    parser.add_argument('--n-estimators', type=int, default=100)
+    args = parser.parse_args()
+    try:
+        train_two_hand_model(args.data_path, args.output_path, n_estimators=args.n_estimators)
+    except ValueError as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)